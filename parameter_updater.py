@@ -4,68 +4,213 @@ Symfony Parameters.yml Updater
 Aktualisiert parameters.yml Dateien während Berechtigungen und Besitzverhältnisse erhalten bleiben.
 """
 
+import io
 import os
 import sys
+import copy
 import stat
 import pwd
 import grp
 import shutil
+import tempfile
 import yaml
 import argparse
 import logging
-from datetime import datetime
+import logging.handlers
+import functools
+import queue
+import atexit
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, List, Optional, Tuple
+
+# libyaml-Bindings verwenden, falls verfügbar (deutlich schneller als reines Python)
+try:
+    from yaml import CSafeLoader as YamlLoader, CSafeDumper as YamlDumper
+except ImportError:
+    from yaml import SafeLoader as YamlLoader, SafeDumper as YamlDumper
+
+
+@functools.lru_cache(maxsize=128)
+def _parse_yaml_cached(file_path: str, mtime_ns: int, size: int) -> Any:
+    """
+    Parst eine YAML-Datei; der Cache-Key enthält mtime und Größe, damit
+    geänderte Dateien automatisch neu eingelesen werden.
+    """
+    with open(file_path, "r", encoding="utf-8") as file:
+        return yaml.load(file, Loader=YamlLoader)
+
+
+@functools.lru_cache(maxsize=256)
+def _uid_name(uid: int) -> str:
+    """Löst eine UID in den Benutzernamen auf (gecacht, NSS kann langsam sein)."""
+    return pwd.getpwuid(uid).pw_name
+
+
+@functools.lru_cache(maxsize=256)
+def _gid_name(gid: int) -> str:
+    """Löst eine GID in den Gruppennamen auf (gecacht, NSS kann langsam sein)."""
+    return grp.getgrgid(gid).gr_name
+
+
+def _loaded_parameter_keys(content: Any) -> List[str]:
+    """Liefert die Schlüssel unter ``parameters:`` aus dem geladenen Dokument."""
+    document = yaml.load(content, Loader=YamlLoader)
+    parameters = document.get("parameters") if isinstance(document, dict) else None
+    return list(parameters) if isinstance(parameters, dict) else []
+
+
+def parameter_keys(content: Any) -> List[str]:
+    """
+    Liefert die Schlüssel unter ``parameters:``, ohne das Dokument zu laden.
+
+    Es wird nur der Event-Stream gelesen; das Parsen endet am Ende des
+    ``parameters``-Mappings, verschachtelte Werte werden übersprungen.
+    Merge-Keys (``<<: *anker``) und Aliase als ``parameters``-Wert lassen
+    sich so nicht auflösen, dann wird das Dokument doch vollständig geladen.
+    """
+    keys: List[str] = []
+    # Pro offener Collection: [ist Mapping, nächster Knoten ist ein Schlüssel]
+    stack: List[List[bool]] = []
+    target_depth = None
+    parameters_value_next = False
+
+    for event in yaml.parse(content, Loader=YamlLoader):
+        if isinstance(event, (yaml.MappingEndEvent, yaml.SequenceEndEvent)):
+            stack.pop()
+            if target_depth is not None and len(stack) < target_depth:
+                break
+            continue
+        if not isinstance(
+            event, (yaml.ScalarEvent, yaml.AliasEvent, yaml.CollectionStartEvent)
+        ):
+            continue
+
+        parent = stack[-1] if stack else None
+        is_key = parent is not None and parent[0] and parent[1]
+        if parent is not None and parent[0]:
+            parent[1] = not parent[1]
+
+        if parameters_value_next:
+            parameters_value_next = False
+            if isinstance(event, yaml.AliasEvent):
+                return _loaded_parameter_keys(content)
+            if not isinstance(event, yaml.MappingStartEvent):
+                break
+            target_depth = len(stack) + 1
+        elif is_key and isinstance(event, yaml.ScalarEvent):
+            if len(stack) == target_depth:
+                if event.value == "<<" and event.implicit[0]:
+                    return _loaded_parameter_keys(content)
+                keys.append(event.value)
+            elif len(stack) == 1 and target_depth is None:
+                parameters_value_next = event.value == "parameters"
+
+        if isinstance(event, yaml.CollectionStartEvent):
+            stack.append([isinstance(event, yaml.MappingStartEvent), True])
+
+    # Doppelte Schlüssel: beim Laden gewinnt der letzte Wert, gelistet wird
+    # jeder Name wie dort nur einmal
+    return list(dict.fromkeys(keys))
 
 
 class ParameterUpdater:
+    # Einheitliche YAML-Ausgabe, einmalig vorkonfiguriert
+    _DUMP_KW = dict(
+        Dumper=YamlDumper,
+        default_flow_style=False,
+        allow_unicode=True,
+        indent=4,
+        sort_keys=False,
+    )
+    _dump = staticmethod(functools.partial(yaml.dump, **_DUMP_KW))
+
     def __init__(self, log_level: str = "INFO"):
         """Initialize the parameter updater with logging."""
         self.setup_logging(log_level)
         self.logger = logging.getLogger(__name__)
+        self.logger.debug(
+            "YAML-Backend: %s/%s", YamlLoader.__name__, YamlDumper.__name__
+        )
 
     def setup_logging(self, level: str):
-        """Setup logging configuration."""
-        logging.basicConfig(
-            level=getattr(logging, level.upper()),
-            format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-            handlers=[
-                logging.FileHandler("parameter_updater.log"),
-                logging.StreamHandler(sys.stdout),
-            ],
-        )
+        """
+        Setup logging configuration.
+
+        Log-Einträge werden über eine Queue an einen Listener-Thread übergeben,
+        damit Datei- und Konsolen-I/O nicht im Aufrufer-Thread stattfinden.
+        """
+        self._log_listener = None
+        root_logger = logging.getLogger()
+
+        # Wie logging.basicConfig: bestehende Konfiguration nicht überschreiben
+        if root_logger.handlers:
+            return
 
-    def get_file_permissions(self, file_path: str) -> Tuple[int, int, int]:
+        formatter = logging.Formatter(
+            "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+        )
+        handlers = [
+            logging.FileHandler("parameter_updater.log"),
+            logging.StreamHandler(sys.stdout),
+        ]
+        for handler in handlers:
+            handler.setFormatter(formatter)
+
+        log_queue = queue.Queue(-1)
+        self._log_handler = logging.handlers.QueueHandler(log_queue)
+        root_logger.addHandler(self._log_handler)
+        root_logger.setLevel(getattr(logging, level.upper()))
+
+        self._log_listener = logging.handlers.QueueListener(log_queue, *handlers)
+        self._log_listener.start()
+        atexit.register(self.close)
+
+    def close(self):
+        """Stoppt den Logging-Listener und schreibt ausstehende Einträge."""
+        if self._log_listener is None:
+            return
+
+        self._log_listener.stop()
+        for handler in self._log_listener.handlers:
+            handler.close()
+        logging.getLogger().removeHandler(self._log_handler)
+        self._log_listener = None
+
+    def get_file_permissions(
+        self, file_path: str, stat_info: Optional[os.stat_result] = None
+    ) -> Tuple[int, int, int]:
         """
         Ermittelt die aktuellen Berechtigungen, UID und GID einer Datei.
 
         Args:
             file_path: Pfad zur Datei
+            stat_info: Bereits ermitteltes stat-Ergebnis (spart einen stat-Aufruf)
 
         Returns:
             Tuple mit (permissions, uid, gid)
         """
         try:
-            stat_info = os.stat(file_path)
+            if stat_info is None:
+                stat_info = os.stat(file_path)
             permissions = stat.S_IMODE(stat_info.st_mode)
             uid = stat_info.st_uid
             gid = stat_info.st_gid
 
             # Log current permissions for debugging
-            user_name = pwd.getpwuid(uid).pw_name
-            group_name = grp.getgrgid(gid).gr_name
-            perm_str = oct(permissions)
-
-            self.logger.info(f"Aktuelle Berechtigungen für {file_path}:")
-            self.logger.info(f"  Berechtigungen: {perm_str}")
-            self.logger.info(f"  Besitzer: {user_name} (UID: {uid})")
-            self.logger.info(f"  Gruppe: {group_name} (GID: {gid})")
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info("Aktuelle Berechtigungen für %s:", file_path)
+                self.logger.info("  Berechtigungen: %s", oct(permissions))
+                self.logger.info("  Besitzer: %s (UID: %d)", _uid_name(uid), uid)
+                self.logger.info("  Gruppe: %s (GID: %d)", _gid_name(gid), gid)
 
             return permissions, uid, gid
 
         except (OSError, KeyError) as e:
             self.logger.error(
-                f"Fehler beim Ermitteln der Berechtigungen für {file_path}: {e}"
+                "Fehler beim Ermitteln der Berechtigungen für %s: %s", file_path, e
             )
             raise
 
@@ -82,19 +227,37 @@ class ParameterUpdater:
             gid: Group ID
         """
         try:
+            # Aktuellen Zustand lesen, nur Abweichungen korrigieren
+            stat_info = os.stat(file_path)
+
             # Besitzverhältnisse wiederherstellen
-            os.chown(file_path, uid, gid)
-            self.logger.info(
-                f"Besitzverhältnisse wiederhergestellt: UID={uid}, GID={gid}"
-            )
+            if stat_info.st_uid != uid or stat_info.st_gid != gid:
+                os.chown(file_path, uid, gid)
+                self.logger.debug(
+                    "Besitzverhältnisse wiederhergestellt: UID=%s, GID=%s", uid, gid
+                )
+            else:
+                self.logger.debug(
+                    "Besitzverhältnisse übersprungen (bereits korrekt): UID=%s, GID=%s",
+                    uid,
+                    gid,
+                )
 
             # Berechtigungen wiederherstellen
-            os.chmod(file_path, permissions)
-            self.logger.info(f"Berechtigungen wiederhergestellt: {oct(permissions)}")
+            if stat.S_IMODE(stat_info.st_mode) != permissions:
+                os.chmod(file_path, permissions)
+                self.logger.debug("Berechtigungen wiederhergestellt: 0o%o", permissions)
+            else:
+                self.logger.debug(
+                    "Berechtigungen übersprungen (bereits korrekt): 0o%o",
+                    permissions,
+                )
 
         except OSError as e:
             self.logger.error(
-                f"Fehler beim Wiederherstellen der Berechtigungen für {file_path}: {e}"
+                "Fehler beim Wiederherstellen der Berechtigungen für %s: %s",
+                file_path,
+                e,
             )
             raise
 
@@ -102,44 +265,74 @@ class ParameterUpdater:
         """
         Erstellt ein Backup der ursprünglichen Datei.
 
+        Das Backup wird als Hardlink angelegt, es werden also keine Daten
+        kopiert. Das setzt voraus, dass die Originaldatei anschließend per
+        Umbenennen ersetzt wird (siehe update_parameters) und nicht direkt
+        überschrieben - sonst würde sich das Backup mitändern. Ist kein
+        Hardlink möglich (z.B. anderes Dateisystem), wird kopiert.
+
         Args:
             file_path: Pfad zur ursprünglichen Datei
 
         Returns:
             Pfad zur Backup-Datei
         """
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_path = f"{file_path}.backup_{timestamp}"
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        # PID und Thread-ID verhindern Kollisionen bei parallelen Backups
+        backup_path = (
+            f"{file_path}.backup_{timestamp}_{os.getpid()}_{threading.get_ident()}"
+        )
 
         try:
-            shutil.copy2(file_path, backup_path)
-            self.logger.info(f"Backup erstellt: {backup_path}")
+            try:
+                os.link(file_path, backup_path)
+            except OSError:
+                shutil.copy2(file_path, backup_path)
+            self.logger.info("Backup erstellt: %s", backup_path)
             return backup_path
 
         except IOError as e:
-            self.logger.error(f"Fehler beim Erstellen des Backups: {e}")
+            self.logger.error("Fehler beim Erstellen des Backups: %s", e)
             raise
 
-    def load_yaml_file(self, file_path: str) -> Dict[str, Any]:
+    def load_yaml_file(
+        self, file_path: str, stat_info: Optional[os.stat_result] = None
+    ) -> Dict[str, Any]:
         """
         Lädt eine YAML-Datei und gibt den Inhalt zurück.
 
         Args:
             file_path: Pfad zur YAML-Datei
+            stat_info: Bereits ermitteltes os.stat-Ergebnis der Datei
 
         Returns:
             Dictionary mit dem YAML-Inhalt
         """
         try:
-            with open(file_path, "r", encoding="utf-8") as file:
-                content = yaml.safe_load(file)
-                self.logger.info(f"YAML-Datei geladen: {file_path}")
-                return content or {}
+            if stat_info is None:
+                stat_info = os.stat(file_path)
+            content = _parse_yaml_cached(
+                file_path, stat_info.st_mtime_ns, stat_info.st_size
+            )
+            self.logger.info("YAML-Datei geladen: %s", file_path)
+            # Kopie zurückgeben, damit Aufrufer den Cache-Eintrag nicht verändern
+            return copy.deepcopy(content) or {}
 
         except (IOError, yaml.YAMLError) as e:
-            self.logger.error(f"Fehler beim Laden der YAML-Datei {file_path}: {e}")
+            self.logger.error("Fehler beim Laden der YAML-Datei %s: %s", file_path, e)
             raise
 
+    def _write_yaml(self, file, content: Dict[str, Any]):
+        """
+        Schreibt Header und YAML-Inhalt in ein binär geöffnetes Dateiobjekt.
+
+        Der Emitter erzeugt direkt UTF-8-Bytes, ein zusätzlicher
+        TextIOWrapper zum Kodieren entfällt.
+        """
+        # Symfony-spezifische YAML-Formatierung
+        file.write(b"# This file is auto-generated during the composer install\n")
+        self._dump(content, file, encoding="utf-8")
+
     def save_yaml_file(self, file_path: str, content: Dict[str, Any]):
         """
         Speichert Inhalt in eine YAML-Datei mit korrekten Einrückungen.
@@ -149,26 +342,150 @@ class ParameterUpdater:
             content: Dictionary mit dem Inhalt
         """
         try:
-            with open(file_path, "w", encoding="utf-8") as file:
-                # Symfony-spezifische YAML-Formatierung
-                file.write(
-                    "# This file is auto-generated during the composer install\n"
-                )
-                yaml.dump(
-                    content,
-                    file,
-                    default_flow_style=False,
-                    allow_unicode=True,
-                    indent=4,
-                    sort_keys=False,
-                )
+            with open(file_path, "wb") as file:
+                self._write_yaml(file, content)
 
-            self.logger.info(f"YAML-Datei gespeichert: {file_path}")
+            self.logger.info("YAML-Datei gespeichert: %s", file_path)
 
         except IOError as e:
-            self.logger.error(f"Fehler beim Speichern der YAML-Datei {file_path}: {e}")
+            self.logger.error(
+                "Fehler beim Speichern der YAML-Datei %s: %s", file_path, e
+            )
+            raise
+
+        finally:
+            # Geänderte Datei darf nicht aus dem Cache bedient werden
+            self.clear_yaml_cache()
+
+    def _atomic_write_yaml(
+        self,
+        file_path: str,
+        content: Dict[str, Any],
+        permissions: int,
+        uid: int,
+        gid: int,
+    ):
+        """
+        Schreibt eine YAML-Datei atomar über eine temporäre Datei im selben
+        Verzeichnis. Berechtigungen und Besitzer werden vor dem Umbenennen
+        gesetzt, ein nachträgliches chown/chmod entfällt.
+
+        Args:
+            file_path: Pfad zur YAML-Datei
+            content: Dictionary mit dem Inhalt
+            permissions: Berechtigungen (oktal)
+            uid: User ID
+            gid: Group ID
+        """
+        # Symlinks auflösen, damit das Ziel und nicht der Link ersetzt wird
+        target_path = os.path.realpath(file_path)
+        temp_file = tempfile.NamedTemporaryFile(
+            mode="wb",
+            dir=os.path.dirname(target_path),
+            prefix=f".{os.path.basename(target_path)}.",
+            suffix=".tmp",
+            delete=False,
+        )
+
+        try:
+            with temp_file:
+                self._write_yaml(temp_file, content)
+                temp_file.flush()
+
+                fd = temp_file.fileno()
+                temp_stat = os.fstat(fd)
+                if temp_stat.st_uid != uid or temp_stat.st_gid != gid:
+                    os.fchown(fd, uid, gid)
+                os.fchmod(fd, permissions)
+                os.fsync(fd)
+
+            os.replace(temp_file.name, target_path)
+            self.logger.info("YAML-Datei gespeichert: %s", file_path)
+
+        except BaseException as e:
+            # Auch Dump-Fehler (z.B. nicht darstellbare Werte) dürfen keine
+            # temporäre Datei neben der parameters.yml zurücklassen
+            self.logger.error(
+                "Fehler beim Speichern der YAML-Datei %s: %s", file_path, e
+            )
+            try:
+                os.unlink(temp_file.name)
+            except OSError:
+                pass
             raise
 
+        finally:
+            # Geänderte Datei darf nicht aus dem Cache bedient werden
+            self.clear_yaml_cache()
+
+    def clear_yaml_cache(self):
+        """Leert den Cache der geparsten YAML-Dateien."""
+        _parse_yaml_cached.cache_clear()
+
+    @staticmethod
+    def _same_value(current: Any, new: Any) -> bool:
+        """
+        Vergleicht zwei YAML-Werte typgenau, da == z.B. 1, 1.0 und True
+        gleichsetzt, die in der Datei aber unterschiedlich geschrieben werden.
+        """
+        if type(current) is not type(new):
+            return False
+        if isinstance(new, dict):
+            return current.keys() == new.keys() and all(
+                ParameterUpdater._same_value(current[key], value)
+                for key, value in new.items()
+            )
+        if isinstance(new, list):
+            return len(current) == len(new) and all(
+                map(ParameterUpdater._same_value, current, new)
+            )
+        return current == new
+
+    @staticmethod
+    def _parameters_unchanged(
+        content: Dict[str, Any], new_parameters: Dict[str, Any]
+    ) -> bool:
+        """Prüft, ob alle neuen Parameter bereits mit diesem Wert gesetzt sind."""
+        current_parameters = content.get("parameters") or {}
+        return all(
+            key in current_parameters
+            and ParameterUpdater._same_value(current_parameters[key], value)
+            for key, value in new_parameters.items()
+        )
+
+    def update_parameters_bytes(
+        self, data: bytes, new_parameters: Dict[str, Any]
+    ) -> Optional[bytes]:
+        """
+        Aktualisiert den Inhalt einer parameters.yml im Speicher.
+
+        Args:
+            data: Bisheriger Dateiinhalt (UTF-8)
+            new_parameters: Dictionary mit neuen Parametern
+
+        Returns:
+            Neuer Dateiinhalt, unverändert wenn keine Änderung nötig ist,
+            None bei Fehlern
+        """
+        try:
+            current_content = yaml.load(data, Loader=YamlLoader) or {}
+
+            if self._parameters_unchanged(current_content, new_parameters):
+                self.logger.info("Parameter bereits aktuell, keine Änderung nötig")
+                return data
+
+            if "parameters" not in current_content:
+                current_content["parameters"] = {}
+            current_content["parameters"].update(new_parameters)
+
+            buffer = io.BytesIO()
+            self._write_yaml(buffer, current_content)
+            return buffer.getvalue()
+
+        except Exception as e:
+            self.logger.error("Fehler beim Aktualisieren der Parameter: %s", e)
+            return None
+
     def update_parameters(
         self, file_path: str, new_parameters: Dict[str, Any], create_backup: bool = True
     ) -> bool:
@@ -184,21 +501,30 @@ class ParameterUpdater:
             True wenn erfolgreich, False bei Fehlern
         """
         try:
-            # Prüfen ob Datei existiert
-            if not os.path.exists(file_path):
-                self.logger.error(f"Datei nicht gefunden: {file_path}")
+            # Prüfen ob Datei existiert (ein stat für Existenz und Berechtigungen)
+            try:
+                stat_info = os.stat(file_path)
+            except FileNotFoundError:
+                self.logger.error("Datei nicht gefunden: %s", file_path)
                 return False
 
             # Aktuelle Berechtigungen speichern
-            permissions, uid, gid = self.get_file_permissions(file_path)
+            permissions, uid, gid = self.get_file_permissions(file_path, stat_info)
+
+            # Aktuelle Parameter laden
+            current_content = self.load_yaml_file(file_path, stat_info)
+
+            # Keine Änderung: Backup, Schreiben und Berechtigungen überspringen
+            if self._parameters_unchanged(current_content, new_parameters):
+                self.logger.info(
+                    "Parameter bereits aktuell, keine Änderung nötig: %s", file_path
+                )
+                return True
 
             # Backup erstellen
             if create_backup:
                 self.create_backup(file_path)
 
-            # Aktuelle Parameter laden
-            current_content = self.load_yaml_file(file_path)
-
             # Parameter aktualisieren
             if "parameters" not in current_content:
                 current_content["parameters"] = {}
@@ -206,17 +532,14 @@ class ParameterUpdater:
             # Neue Parameter hinzufügen/aktualisieren
             current_content["parameters"].update(new_parameters)
 
-            # Datei speichern
-            self.save_yaml_file(file_path, current_content)
+            # Datei atomar speichern (inkl. Berechtigungen und Besitzer)
+            self._atomic_write_yaml(file_path, current_content, permissions, uid, gid)
 
-            # Berechtigungen wiederherstellen
-            self.restore_file_permissions(file_path, permissions, uid, gid)
-
-            self.logger.info(f"Parameter erfolgreich aktualisiert in: {file_path}")
+            self.logger.info("Parameter erfolgreich aktualisiert in: %s", file_path)
             return True
 
         except Exception as e:
-            self.logger.error(f"Fehler beim Aktualisieren der Parameter: {e}")
+            self.logger.error("Fehler beim Aktualisieren der Parameter: %s", e)
             return False
 
     def update_multiple_servers(
@@ -238,19 +561,43 @@ class ParameterUpdater:
             Dictionary mit Ergebnissen pro Server
         """
         results = {}
+        # Pro Datei: (Pfad, zusammengeführte Parameter, beteiligte Server)
+        groups: Dict[str, Tuple[str, Dict[str, Any], List[str]]] = {}
 
         for server_name, config in server_configs.items():
-            self.logger.info(f"Aktualisiere Server: {server_name}")
-
             file_path = config.get("file_path")
-            parameters = config.get("parameters", {})
 
             if not file_path:
-                self.logger.error(f"Kein file_path für Server {server_name} angegeben")
+                self.logger.error("Kein file_path für Server %s angegeben", server_name)
                 results[server_name] = False
                 continue
 
-            results[server_name] = self.update_parameters(file_path, parameters)
+            # Platzhalter, damit die Reihenfolge der Konfiguration erhalten bleibt
+            results[server_name] = False
+
+            # Server mit derselben Datei werden zu einem Schreibvorgang zusammengefasst
+            group_key = os.path.realpath(file_path)
+            if group_key not in groups:
+                groups[group_key] = (file_path, {}, [])
+            _, merged_parameters, server_names = groups[group_key]
+            merged_parameters.update(config.get("parameters", {}))
+            server_names.append(server_name)
+
+        if not groups:
+            return results
+
+        # Dateien sind unabhängig voneinander und werden parallel aktualisiert
+        with ThreadPoolExecutor(max_workers=min(32, len(groups))) as executor:
+            futures = {}
+            for file_path, parameters, server_names in groups.values():
+                self.logger.info("Aktualisiere Server: %s", ", ".join(server_names))
+                future = executor.submit(self.update_parameters, file_path, parameters)
+                futures[future] = server_names
+
+            for future in as_completed(futures):
+                success = future.result()
+                for server_name in futures[future]:
+                    results[server_name] = success
 
         return results
 
@@ -265,12 +612,16 @@ class ParameterUpdater:
             True wenn gültig, False bei Syntax-Fehlern
         """
         try:
-            self.load_yaml_file(file_path)
-            self.logger.info(f"YAML-Syntax gültig: {file_path}")
+            # Nur den Knotengraphen aufbauen, ohne Python-Objekte; anders als
+            # der reine Event-Stream erkennt das auch undefinierte Aliase und
+            # zusätzliche Dokumente
+            with open(file_path, "r", encoding="utf-8") as file:
+                yaml.compose(file, Loader=YamlLoader)
+            self.logger.info("YAML-Syntax gültig: %s", file_path)
             return True
 
         except yaml.YAMLError as e:
-            self.logger.error(f"YAML-Syntax-Fehler in {file_path}: {e}")
+            self.logger.error("YAML-Syntax-Fehler in %s: %s", file_path, e)
             return False
 
     def generate_sample_config(self) -> Dict[str, Any]:
@@ -314,8 +665,9 @@ class ParameterUpdater:
         }
 
 
-def main():
-    """Hauptfunktion für Command-Line Interface."""
+@functools.lru_cache(maxsize=1)
+def _get_parser() -> argparse.ArgumentParser:
+    """Erstellt den Argument-Parser (einmalig pro Prozess)."""
     parser = argparse.ArgumentParser(
         description="Symfony Parameters.yml Updater",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -360,6 +712,12 @@ Beispiele:
         help="Log-Level (default: INFO)",
     )
 
+    return parser
+
+
+def main():
+    """Hauptfunktion für Command-Line Interface."""
+    parser = _get_parser()
     args = parser.parse_args()
 
     updater = ParameterUpdater(args.log_level)
@@ -368,7 +726,7 @@ Beispiele:
     if args.generate_config:
         config = updater.generate_sample_config()
         with open("server_config_example.yml", "w") as f:
-            yaml.dump(config, f, default_flow_style=False, indent=2)
+            yaml.dump(config, f, Dumper=YamlDumper, default_flow_style=False, indent=2)
         print(
             "Beispiel-Konfiguration wurde in 'server_config_example.yml' gespeichert."
         )
@@ -387,7 +745,7 @@ Beispiele:
     if args.config:
         try:
             with open(args.config, "r") as f:
-                server_configs = yaml.safe_load(f)
+                server_configs = yaml.load(f, Loader=YamlLoader)
 
             results = updater.update_multiple_servers(server_configs)
 
@@ -403,13 +761,14 @@ Beispiele:
 
     # Einzelne Datei aktualisieren
     if args.file and args.param:
-        parameters = {}
-        for param in args.param:
-            if "=" not in param:
-                print(f"❌ Ungültiges Parameter-Format: {param} (erwartet: key=value)")
-                sys.exit(1)
-            key, value = param.split("=", 1)
-            parameters[key.strip()] = value.strip()
+        pairs = [param.partition("=") for param in args.param]
+        invalid = next(
+            (param for param, (_, sep, _) in zip(args.param, pairs) if not sep), None
+        )
+        if invalid is not None:
+            print(f"❌ Ungültiges Parameter-Format: {invalid} (erwartet: key=value)")
+            sys.exit(1)
+        parameters = {key.strip(): value.strip() for key, _, value in pairs}
 
         success = updater.update_parameters(
             args.file, parameters, create_backup=not args.no_backup
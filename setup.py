@@ -53,6 +53,16 @@ setup(
             "pytest",
             "pytest-cov",
         ],
+        "fast": [
+            "orjson",
+        ],
+        "async": [
+            "asyncssh",
+        ],
+        "server": [
+            "waitress",
+            "flask-compress",
+        ],
     },
     entry_points={
         "console_scripts": [
@@ -4,73 +4,195 @@ SSH Remote Manager für Symfony Parameters.yml
 Verwaltet parameters.yml Dateien über SSH-Verbindungen basierend auf Konfigurationsdatei.
 """
 
+from __future__ import annotations
+
 import os
+import re
 import sys
 import yaml
 import json
 import argparse
+import asyncio
 import logging
-import tempfile
+import io
+import functools
+import copy
+import shlex
 import secrets
 import string
+import threading
+import weakref
+import queue
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple
+from typing import TYPE_CHECKING, Dict, Iterator, List, Any, Optional, Tuple
 from datetime import datetime
 
 try:
-    import paramiko
-    from scp import SCPClient
+    import orjson
 except ImportError:
-    print("❌ Fehlende Dependencies! Installieren Sie:")
-    print("pip install paramiko scp")
-    sys.exit(1)
+    orjson = None
+
+if TYPE_CHECKING:
+    import paramiko
+
+from parameter_updater import ParameterUpdater, YamlLoader
+
+# Markierungen in der Ausgabe zusammengefasster Remote-Befehle
+PERMISSIONS_MARKER = "__PERMISSIONS__"
+BACKUP_MARKER = "__BACKUP_OK__"
+CHOWN_FAILED_MARKER = "__CHOWN_FAILED__"
+FAST_OK_MARKER = "__FAST_OK__"
+FAST_UNCHANGED_MARKER = "__FAST_UNCHANGED__"
+FAST_SKIP_MARKER = "__FAST_SKIP__"
+
+# Parameter-Namen, die ohne Escaping in grep/sed-Ausdrücken verwendet werden können
+_SIMPLE_KEY = re.compile(r"^[A-Za-z0-9_.-]+$")
+
+
+@functools.lru_cache(maxsize=None)
+def _get_paramiko():
+    """Importiert paramiko erst bei der ersten SSH-Nutzung."""
+    try:
+        import paramiko
+    except ImportError as e:
+        raise ImportError(
+            "Fehlende Dependencies! Installieren Sie: pip install paramiko"
+        ) from e
+    return paramiko
+
+
+def _get_asyncssh():
+    """Importiert asyncssh nur für den asynchronen Bulk-Modus."""
+    try:
+        import asyncssh
+    except ImportError as e:
+        raise ImportError(
+            "Für --async wird asyncssh benötigt: pip install asyncssh"
+        ) from e
+    return asyncssh
+
 
-from parameter_updater import ParameterUpdater
+def random_secret(alphabet: bytes, length: int) -> str:
+    """
+    Erzeugt einen zufälligen String aus den Zeichen des Alphabets.
+
+    Die Zufallsbytes werden in Blöcken gezogen, auf die kleinste passende
+    Bitbreite maskiert und Werte außerhalb des Alphabets verworfen, damit
+    jedes Zeichen gleich wahrscheinlich bleibt.
+    """
+    mask = (1 << (len(alphabet) - 1).bit_length()) - 1
+    secret = bytearray()
+    while len(secret) < length:
+        raw = secrets.token_bytes(length * 2)
+        secret += bytes(alphabet[b & mask] for b in raw if (b & mask) < len(alphabet))
+    return secret[:length].decode("ascii")
+
+
+# Geparste Konfigurationen, Schlüssel: (Pfad, mtime_ns, Größe)
+_CONFIG_CACHE: Dict[Tuple[str, int, int], Dict[str, Any]] = {}
 
 
 class SSHManager:
-    def __init__(self, config_file: str = "ssh_config.yml", log_level: str = "INFO"):
+    _SECRET_ALPHABET = (string.ascii_letters + string.digits + "!@#$%^&*").encode()
+
+    def __init__(
+        self,
+        config_file: str = "ssh_config.yml",
+        log_level: str = "INFO",
+        max_workers: int = 8,
+        pool_size: Optional[int] = None,
+        use_async: bool = False,
+        async_concurrency: int = 100,
+        max_sessions: int = 10,
+    ):
         """Initialize SSH Manager with configuration."""
         self.config_file = config_file
+        # Bulk-Operationen über asyncssh statt über den Thread-Pool
+        self.use_async = use_async
+        self.async_concurrency = async_concurrency
+        # Kanäle pro asyncssh-Verbindung (OpenSSH: MaxSessions 10)
+        self.max_sessions = max_sessions
         self.logger = logging.getLogger(__name__)
         self.config = self.load_config()
         self.updater = ParameterUpdater(log_level)
-        self.ssh_connections = {}
+        self.max_workers = max_workers
+        self.pool_size = pool_size or max_workers
+        # Pool freier, authentifizierter Verbindungen pro Server (über _pool)
+        self._pools: Dict[str, queue.Queue] = {}
+        # Alle geöffneten Verbindungen pro Server (zum Schließen)
+        self.ssh_connections: Dict[str, List[paramiko.SSHClient]] = defaultdict(list)
+        self._connections_lock = threading.Lock()
+        # Sperre pro Verbindung, ein SFTP-Kanal ist nicht thread-sicher
+        self._sftp_locks: "weakref.WeakKeyDictionary[Any, threading.Lock]" = (
+            weakref.WeakKeyDictionary()
+        )
+        # Für eine Server-Sitzung fest zugewiesene Verbindung pro Thread
+        self._local = threading.local()
 
     def load_config(self) -> Dict[str, Any]:
         """Lädt die SSH-Konfiguration."""
         try:
-            with open(self.config_file, "r", encoding="utf-8") as f:
-                config = yaml.safe_load(f)
-                self.logger.info(f"Konfiguration geladen: {self.config_file}")
-                return config
+            stat_info = os.stat(self.config_file)
+            key = (
+                os.path.abspath(self.config_file),
+                stat_info.st_mtime_ns,
+                stat_info.st_size,
+            )
+            config = _CONFIG_CACHE.get(key)
+            if config is None:
+                with open(self.config_file, "r", encoding="utf-8") as f:
+                    config = yaml.load(f, Loader=YamlLoader)
+                # Veraltete Stände derselben Datei verwerfen
+                for stale in [k for k in _CONFIG_CACHE if k[0] == key[0]]:
+                    del _CONFIG_CACHE[stale]
+                _CONFIG_CACHE[key] = config
+                self.logger.info("Konfiguration geladen: %s", self.config_file)
+            else:
+                self.logger.debug("Konfiguration aus Cache: %s", self.config_file)
+            # Kopie, damit Änderungen am Objekt den Cache nicht verfälschen
+            config = copy.deepcopy(config)
+            self._customer_index = self._build_customer_index(config)
+            self._resolved_server_params = self._resolve_server_params(config)
+            return config
         except FileNotFoundError:
-            self.logger.error(f"Konfigurationsdatei nicht gefunden: {self.config_file}")
+            self.logger.error(
+                "Konfigurationsdatei nicht gefunden: %s", self.config_file
+            )
             raise
         except yaml.YAMLError as e:
-            self.logger.error(f"Fehler beim Laden der Konfiguration: {e}")
+            self.logger.error("Fehler beim Laden der Konfiguration: %s", e)
             raise
 
-    def get_ssh_connection(self, server_name: str) -> paramiko.SSHClient:
-        """Erstellt oder gibt bestehende SSH-Verbindung zurück."""
-        if server_name in self.ssh_connections:
-            # Teste ob Verbindung noch aktiv ist
-            try:
-                transport = self.ssh_connections[server_name].get_transport()
-                if transport and transport.is_active():
-                    return self.ssh_connections[server_name]
-            except:
-                pass
-
-        # Neue Verbindung erstellen
-        server_config = self.config["servers"][server_name]
-        ssh_settings = self.config.get("ssh_settings", {})
-
-        ssh = paramiko.SSHClient()
-        ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-
-        try:
-            # SSH Verbindungsparameter
+    @staticmethod
+    def _build_customer_index(
+        config: Dict[str, Any],
+    ) -> List[Tuple[str, str, Dict[str, Any], Dict[str, Any]]]:
+        """
+        Flacht die Server-/Kundenstruktur einmalig ab.
+
+        Returns:
+            Liste von (Server, Kunde, Server-Konfiguration, Kunden-Konfiguration)
+        """
+        return [
+            (server_name, customer_name, server_config, customer_config)
+            for server_name, server_config in config["servers"].items()
+            for customer_name, customer_config in server_config["customers"].items()
+        ]
+
+    def _resolve_server_params(
+        self, config: Dict[str, Any]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Ermittelt die paramiko-Verbindungsparameter aller Server einmalig
+        (inklusive aufgelöstem SSH-Key-Pfad).
+        """
+        ssh_settings = config.get("ssh_settings", {})
+        resolved = {}
+
+        for server_name, server_config in config["servers"].items():
             connect_params = {
                 "hostname": server_config["host"],
                 "port": server_config.get("port", 22),
@@ -84,85 +206,280 @@ class SSHManager:
                 if os.path.exists(key_path):
                     connect_params["key_filename"] = key_path
                 else:
-                    self.logger.warning(f"SSH Key nicht gefunden: {key_path}")
+                    self.logger.warning("SSH Key nicht gefunden: %s", key_path)
 
             if "password" in server_config:
                 connect_params["password"] = server_config["password"]
 
+            resolved[server_name] = connect_params
+
+        return resolved
+
+    def _connect(self, server_name: str) -> paramiko.SSHClient:
+        """Baut eine neue SSH-Verbindung zu einem Server auf."""
+        connect_params = self._resolved_server_params[server_name]
+
+        paramiko = _get_paramiko()
+        ssh = paramiko.SSHClient()
+        ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+
+        try:
             ssh.connect(**connect_params)
-            self.ssh_connections[server_name] = ssh
+            # Keepalive verhindert, dass NAT/Firewalls ruhende Pool-Verbindungen kappen
+            ssh.get_transport().set_keepalive(30)
+
+            with self._connections_lock:
+                self.ssh_connections[server_name].append(ssh)
             self.logger.info(
-                f"SSH-Verbindung hergestellt: {server_name} ({server_config['host']})"
+                "SSH-Verbindung hergestellt: %s (%s)",
+                server_name,
+                connect_params["hostname"],
             )
 
             return ssh
 
         except Exception as e:
-            self.logger.error(f"SSH-Verbindung fehlgeschlagen für {server_name}: {e}")
+            self.logger.error(
+                "SSH-Verbindung fehlgeschlagen für %s: %s", server_name, e
+            )
             raise
 
-    def close_all_connections(self):
-        """Schließt alle SSH-Verbindungen."""
-        for server_name, ssh in self.ssh_connections.items():
+    def _discard_connection(self, server_name: str, ssh: paramiko.SSHClient):
+        """Schließt eine Verbindung und entfernt sie aus der Verwaltung."""
+        with self._connections_lock:
+            connections = self.ssh_connections.get(server_name, [])
+            if ssh in connections:
+                connections.remove(ssh)
+        try:
+            ssh.close()
+        except:
+            pass
+
+    def _pool(self, server_name: str) -> queue.Queue:
+        """
+        Gibt den Pool eines Servers zurück und legt ihn beim ersten Zugriff an.
+
+        Das Anlegen geschieht unter der Sperre, damit zwei Threads nicht je
+        einen eigenen Pool erzeugen und Verbindungen im verworfenen landen.
+        """
+        pool = self._pools.get(server_name)
+        if pool is None:
+            with self._connections_lock:
+                pool = self._pools.setdefault(
+                    server_name, queue.Queue(maxsize=self.pool_size)
+                )
+        return pool
+
+    @contextmanager
+    def _borrow(self, server_name: str) -> Iterator[paramiko.SSHClient]:
+        """
+        Leiht eine Verbindung aus dem Pool des Servers aus und gibt sie danach
+        zurück. Ist keine aktive Verbindung frei, wird eine neue aufgebaut.
+        """
+        pinned = getattr(self._local, "pinned", {})
+        if server_name in pinned:
+            yield pinned[server_name]
+            return
+
+        pool = self._pool(server_name)
+        ssh = None
+
+        while ssh is None:
+            try:
+                candidate = pool.get_nowait()
+            except queue.Empty:
+                ssh = self._connect(server_name)
+                break
+
+            # Teste ob Verbindung noch aktiv ist
+            try:
+                transport = candidate.get_transport()
+                if transport and transport.is_active():
+                    ssh = candidate
+                    continue
+            except:
+                pass
+            self._discard_connection(server_name, candidate)
+
+        try:
+            yield ssh
+        except BaseException:
+            # Nach einem Fehler (Timeout, Kanal abgelehnt, ...) ist der Zustand
+            # der Verbindung unklar, daher nicht in den Pool zurückgeben
+            self._discard_connection(server_name, ssh)
+            raise
+
+        try:
+            pool.put_nowait(ssh)
+        except queue.Full:
+            self._discard_connection(server_name, ssh)
+
+    @contextmanager
+    def _server_session(self, server_name: str) -> Iterator[paramiko.SSHClient]:
+        """
+        Hält eine Verbindung für die Dauer der Sitzung fest, so dass alle
+        Aufrufe dieses Threads für den Server dieselbe Verbindung verwenden.
+        """
+        with self._borrow(server_name) as ssh:
+            pinned = self._local.__dict__.setdefault("pinned", {})
+            pinned[server_name] = ssh
+            try:
+                yield ssh
+            finally:
+                pinned.pop(server_name, None)
+
+    def _get_sftp(self, ssh: paramiko.SSHClient) -> paramiko.SFTPClient:
+        """Gibt den SFTP-Kanal einer Verbindung zurück und öffnet ihn bei Bedarf."""
+        sftp = getattr(ssh, "_sftp", None)
+        if sftp is None or sftp.get_channel().closed:
+            sftp = ssh.open_sftp()
+            ssh._sftp = sftp
+        return sftp
+
+    @contextmanager
+    def _sftp_session(self, ssh: paramiko.SSHClient) -> Iterator[paramiko.SFTPClient]:
+        """Gibt exklusiven Zugriff auf den langlebigen SFTP-Kanal einer Verbindung."""
+        with self._connections_lock:
+            lock = self._sftp_locks.setdefault(ssh, threading.Lock())
+        with lock:
+            yield self._get_sftp(ssh)
+
+    def get_ssh_connection(self, server_name: str) -> paramiko.SSHClient:
+        """
+        Gibt eine aktive SSH-Verbindung aus dem Pool zurück.
+
+        Die Verbindung bleibt im Pool und kann daher gleichzeitig von anderen
+        Aufrufern genutzt werden; für exklusive Nutzung _borrow verwenden.
+        """
+        with self._borrow(server_name) as ssh:
+            return ssh
+
+    def close_all_connections(self, fast: bool = False):
+        """
+        Schließt alle SSH-Verbindungen parallel.
+
+        Args:
+            fast: Nur die Sockets schließen, ohne SSH-Disconnect-Nachricht
+                (für das Programmende, spart einen Roundtrip pro Verbindung)
+        """
+        with self._connections_lock:
+            connections = [
+                (server_name, ssh)
+                for server_name, clients in self.ssh_connections.items()
+                for ssh in clients
+            ]
+            self.ssh_connections.clear()
+            self._pools.clear()
+
+        if not connections:
+            return
+
+        def close(connection):
+            server_name, ssh = connection
             try:
-                ssh.close()
-                self.logger.info(f"SSH-Verbindung geschlossen: {server_name}")
+                transport = ssh.get_transport()
+                if fast and transport is not None:
+                    transport.sock.close()
+                else:
+                    ssh.close()
+                self.logger.info("SSH-Verbindung geschlossen: %s", server_name)
             except:
                 pass
-        self.ssh_connections.clear()
+
+        workers = max(1, min(self.max_workers, len(connections)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(close, connections))
 
     def execute_remote_command(
         self, server_name: str, command: str
     ) -> Tuple[str, str, int]:
         """Führt einen Befehl auf dem Remote-Server aus."""
-        ssh = self.get_ssh_connection(server_name)
-
-        try:
-            stdin, stdout, stderr = ssh.exec_command(command)
-            exit_code = stdout.channel.recv_exit_status()
+        with self._borrow(server_name) as ssh:
+            try:
+                stdin, stdout, stderr = ssh.exec_command(command)
+                exit_code = stdout.channel.recv_exit_status()
 
-            stdout_data = stdout.read().decode("utf-8")
-            stderr_data = stderr.read().decode("utf-8")
+                stdout_data = stdout.read().decode("utf-8")
+                stderr_data = stderr.read().decode("utf-8")
 
-            return stdout_data, stderr_data, exit_code
+                return stdout_data, stderr_data, exit_code
 
-        except Exception as e:
-            self.logger.error(
-                f"Fehler beim Ausführen des Befehls auf {server_name}: {e}"
-            )
-            raise
+            except Exception as e:
+                self.logger.error(
+                    "Fehler beim Ausführen des Befehls auf %s: %s", server_name, e
+                )
+                raise
 
     def download_file(
         self, server_name: str, remote_path: str, local_path: str
     ) -> bool:
         """Lädt eine Datei vom Remote-Server herunter."""
-        ssh = self.get_ssh_connection(server_name)
+        with self._borrow(server_name) as ssh:
+            try:
+                with self._sftp_session(ssh) as sftp:
+                    sftp.get(remote_path, local_path)
+                    self.logger.info(
+                        "Datei heruntergeladen: %s -> %s", remote_path, local_path
+                    )
+                    return True
 
-        try:
-            with SCPClient(ssh.get_transport()) as scp:
-                scp.get(remote_path, local_path)
-                self.logger.info(
-                    f"Datei heruntergeladen: {remote_path} -> {local_path}"
+            except Exception as e:
+                self.logger.error(
+                    "Fehler beim Herunterladen von %s: %s", remote_path, e
                 )
-                return True
+                return False
 
-        except Exception as e:
-            self.logger.error(f"Fehler beim Herunterladen von {remote_path}: {e}")
-            return False
+    def download_bytes(self, server_name: str, remote_path: str) -> Optional[bytes]:
+        """Lädt eine Datei vom Remote-Server direkt in den Speicher."""
+        with self._borrow(server_name) as ssh:
+            try:
+                with self._sftp_session(ssh) as sftp:
+                    buffer = io.BytesIO()
+                    sftp.getfo(remote_path, buffer)
+                    return buffer.getvalue()
+
+            except Exception as e:
+                self.logger.error(
+                    "Fehler beim Herunterladen von %s: %s", remote_path, e
+                )
+                return None
+
+    def stat_remote(
+        self, server_name: str, remote_path: str
+    ) -> Optional[Tuple[int, int]]:
+        """
+        Ermittelt Änderungszeit und Größe einer Remote-Datei per SFTP.
+
+        Liefert None, wenn der Server eines der Attribute nicht mitschickt.
+        Die Änderungszeit hat nur Sekundenauflösung: zwei externe Änderungen
+        gleicher Größe innerhalb einer Sekunde ergeben dasselbe Ergebnis.
+        """
+        with self._borrow(server_name) as ssh:
+            try:
+                with self._sftp_session(ssh) as sftp:
+                    attributes = sftp.stat(remote_path)
+                    if attributes.st_mtime is None or attributes.st_size is None:
+                        return None
+                    return attributes.st_mtime, attributes.st_size
+
+            except Exception as e:
+                self.logger.error("Fehler beim Abfragen von %s: %s", remote_path, e)
+                return None
 
     def upload_file(self, server_name: str, local_path: str, remote_path: str) -> bool:
         """Lädt eine Datei auf den Remote-Server hoch."""
-        ssh = self.get_ssh_connection(server_name)
-
-        try:
-            with SCPClient(ssh.get_transport()) as scp:
-                scp.put(local_path, remote_path)
-                self.logger.info(f"Datei hochgeladen: {local_path} -> {remote_path}")
-                return True
+        with self._borrow(server_name) as ssh:
+            try:
+                with self._sftp_session(ssh) as sftp:
+                    sftp.put(local_path, remote_path)
+                    self.logger.info(
+                        "Datei hochgeladen: %s -> %s", local_path, remote_path
+                    )
+                    return True
 
-        except Exception as e:
-            self.logger.error(f"Fehler beim Hochladen nach {remote_path}: {e}")
-            return False
+            except Exception as e:
+                self.logger.error("Fehler beim Hochladen nach %s: %s", remote_path, e)
+                return False
 
     def get_file_permissions(
         self, server_name: str, file_path: str
@@ -177,7 +494,7 @@ class SSHManager:
                 return {"permissions": parts[0], "owner": parts[1], "group": parts[2]}
 
         self.logger.error(
-            f"Konnte Berechtigungen nicht ermitteln für {file_path}: {stderr}"
+            "Konnte Berechtigungen nicht ermitteln für %s: %s", file_path, stderr
         )
         return None
 
@@ -186,42 +503,52 @@ class SSHManager:
     ) -> bool:
         """Stellt Dateiberechtigungen auf Remote-Server wieder her."""
         try:
-            # Besitzer und Gruppe wiederherstellen
-            chown_cmd = (
-                f"chown {permissions['owner']}:{permissions['group']} '{file_path}'"
-            )
+            command = self._restore_command(file_path, permissions)
             stdout, stderr, exit_code = self.execute_remote_command(
-                server_name, chown_cmd
+                server_name, command
             )
+            return self._check_restore_output(file_path, stdout, stderr, exit_code)
 
-            if exit_code != 0:
-                self.logger.warning(f"chown fehlgeschlagen: {stderr}")
-
-            # Berechtigungen wiederherstellen
-            chmod_cmd = f"chmod {permissions['permissions']} '{file_path}'"
-            stdout, stderr, exit_code = self.execute_remote_command(
-                server_name, chmod_cmd
-            )
+        except Exception as e:
+            self.logger.error("Fehler beim Wiederherstellen der Berechtigungen: %s", e)
+            return False
 
-            if exit_code != 0:
-                self.logger.warning(f"chmod fehlgeschlagen: {stderr}")
-                return False
+    @staticmethod
+    def _restore_command(file_path: str, permissions: Dict[str, Any]) -> str:
+        """Besitzer, Gruppe und Berechtigungen in einem Aufruf wiederherstellen."""
+        owner = f"{permissions['owner']}:{permissions['group']}"
+        path = shlex.quote(file_path)
+        return (
+            f"chown {shlex.quote(owner)} {path} || echo {CHOWN_FAILED_MARKER}; "
+            f"chmod {shlex.quote(str(permissions['permissions']))} {path}"
+        )
 
-            self.logger.info(f"Berechtigungen wiederhergestellt für {file_path}")
-            return True
+    def _check_restore_output(
+        self, file_path: str, stdout: str, stderr: str, exit_code: int
+    ) -> bool:
+        """Wertet die Ausgabe von _restore_command aus."""
+        if CHOWN_FAILED_MARKER in stdout:
+            self.logger.warning("chown fehlgeschlagen: %s", stderr)
 
-        except Exception as e:
-            self.logger.error(f"Fehler beim Wiederherstellen der Berechtigungen: {e}")
+        if exit_code != 0:
+            self.logger.warning("chmod fehlgeschlagen: %s", stderr)
             return False
 
-    def create_remote_backup(self, server_name: str, file_path: str) -> Optional[str]:
-        """Erstellt ein Backup auf dem Remote-Server."""
+        self.logger.info("Berechtigungen wiederhergestellt für %s", file_path)
+        return True
+
+    def _remote_backup_path(self, file_path: str) -> Tuple[str, str]:
+        """Liefert Backup-Verzeichnis und Backup-Pfad für eine Remote-Datei."""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         backup_dir = self.config.get("ssh_settings", {}).get(
             "backup_dir", "/tmp/symfony_backups"
         )
         backup_filename = f"{os.path.basename(file_path)}.backup_{timestamp}"
-        backup_path = f"{backup_dir}/{backup_filename}"
+        return backup_dir, f"{backup_dir}/{backup_filename}"
+
+    def create_remote_backup(self, server_name: str, file_path: str) -> Optional[str]:
+        """Erstellt ein Backup auf dem Remote-Server."""
+        backup_dir, backup_path = self._remote_backup_path(file_path)
 
         # Backup-Verzeichnis erstellen
         mkdir_cmd = f"mkdir -p '{backup_dir}'"
@@ -232,12 +559,147 @@ class SSHManager:
         stdout, stderr, exit_code = self.execute_remote_command(server_name, cp_cmd)
 
         if exit_code == 0:
-            self.logger.info(f"Remote-Backup erstellt: {backup_path}")
+            self.logger.info("Remote-Backup erstellt: %s", backup_path)
             return backup_path
         else:
-            self.logger.error(f"Backup-Erstellung fehlgeschlagen: {stderr}")
+            self.logger.error("Backup-Erstellung fehlgeschlagen: %s", stderr)
             return None
 
+    def _prepare_command(self, file_path: str) -> Tuple[str, str]:
+        """
+        Baut den Befehl, der Berechtigungen ermittelt und ein Backup erstellt.
+
+        Returns:
+            Tuple mit (Befehl, Backup-Pfad)
+        """
+        backup_dir, backup_path = self._remote_backup_path(file_path)
+        path = shlex.quote(file_path)
+        command = (
+            f"stat -c '{PERMISSIONS_MARKER} %a %U %G' {path}; "
+            f"mkdir -p {shlex.quote(backup_dir)} && "
+            f"cp {path} {shlex.quote(backup_path)} && echo {BACKUP_MARKER}"
+        )
+        return command, backup_path
+
+    def _parse_prepare_output(
+        self, file_path: str, backup_path: str, stdout: str, stderr: str
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """Wertet die Ausgabe von _prepare_command aus."""
+        permissions = None
+        backup_created = False
+        for line in stdout.splitlines():
+            parts = line.split()
+            if len(parts) >= 4 and parts[0] == PERMISSIONS_MARKER:
+                permissions = {
+                    "permissions": parts[1],
+                    "owner": parts[2],
+                    "group": parts[3],
+                }
+            elif line.strip() == BACKUP_MARKER:
+                backup_created = True
+
+        if not permissions:
+            self.logger.error(
+                "Konnte Berechtigungen nicht ermitteln für %s: %s", file_path, stderr
+            )
+
+        if backup_created:
+            self.logger.info("Remote-Backup erstellt: %s", backup_path)
+            return permissions, backup_path
+
+        self.logger.error("Backup-Erstellung fehlgeschlagen: %s", stderr)
+        return permissions, None
+
+    def _prepare_remote(
+        self, server_name: str, file_path: str
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """
+        Ermittelt Berechtigungen und erstellt ein Backup in einem einzigen
+        Remote-Aufruf (statt stat, mkdir und cp einzeln).
+
+        Returns:
+            Tuple mit (Berechtigungen oder None, Backup-Pfad oder None)
+        """
+        command, backup_path = self._prepare_command(file_path)
+        stdout, stderr, exit_code = self.execute_remote_command(server_name, command)
+        return self._parse_prepare_output(file_path, backup_path, stdout, stderr)
+
+    def _fast_path_command(
+        self, file_path: str, new_parameters: Dict[str, Any]
+    ) -> Optional[Tuple[str, str]]:
+        """
+        Baut einen sed-Befehl, der einen einzelnen Parameter direkt auf dem
+        Server ersetzt, inklusive Backup und Wiederherstellung der Rechte.
+
+        Der Schnellpfad ist nur für flache Dateien mit skalaren Werten
+        YAML-sicher: Die Datei darf nur den Top-Level-Schlüssel ``parameters``
+        enthalten, keine tiefer eingerückten Zeilen, und der Schlüssel muss
+        genau einmal vorkommen. Trifft das remote nicht zu, meldet der Befehl
+        FAST_SKIP_MARKER und der normale Pfad wird verwendet.
+
+        Returns:
+            Tuple mit (Befehl, Backup-Pfad) oder None, wenn nicht anwendbar
+        """
+        if len(new_parameters) != 1:
+            return None
+
+        key, value = next(iter(new_parameters.items()))
+        if not isinstance(key, str) or not _SIMPLE_KEY.match(key):
+            return None
+        if not isinstance(value, (str, int, float, bool)):
+            return None
+
+        # Wert genau so formatieren wie beim vollständigen Neuschreiben
+        line = self.updater._dump({key: value}).rstrip("\n")
+        if "\n" in line or not line.startswith(f"{key}: "):
+            return None
+
+        key_re = key.replace(".", r"\.")
+        sed_value = (
+            line[len(key) + 2 :]
+            .replace("\\", "\\\\")
+            .replace("|", "\\|")
+            .replace("&", "\\&")
+        )
+        backup_dir, backup_path = self._remote_backup_path(file_path)
+        path = shlex.quote(file_path)
+        key_pattern = shlex.quote(f"^    {key_re}:")
+        sed_expr = shlex.quote(f"s|^(    {key_re}:).*|\\1 {sed_value}|")
+
+        command = (
+            f'if [ "$(grep -c -E {key_pattern} {path})" = 1 ] '
+            f"&& [ \"$(grep -c '^[^[:space:]#]' {path})\" = 1 ] "
+            f"&& ! grep -q -E '^( {{5}}|\t)' {path}; then "
+            f"if grep -q -x -F {shlex.quote('    ' + line)} {path}; then "
+            f"echo {FAST_UNCHANGED_MARKER}; "
+            f"else mode=$(stat -c %a {path}) && owner=$(stat -c %U:%G {path}) "
+            f"&& mkdir -p {shlex.quote(backup_dir)} "
+            f"&& cp {path} {shlex.quote(backup_path)} "
+            f"&& sed -i -E {sed_expr} {path} "
+            f'&& {{ chown "$owner" {path} 2>/dev/null; chmod "$mode" {path}; }} '
+            f"&& echo {FAST_OK_MARKER}; fi; "
+            f"else echo {FAST_SKIP_MARKER}; fi"
+        )
+        return command, backup_path
+
+    def _check_fast_path_output(
+        self, file_path: str, backup_path: str, stdout: str, stderr: str
+    ) -> Optional[bool]:
+        """Wertet die Ausgabe von _fast_path_command aus (None = Fallback)."""
+        markers = stdout.split()
+        if FAST_UNCHANGED_MARKER in markers:
+            self.logger.info("Keine Änderungen für %s", file_path)
+            return True
+        if FAST_OK_MARKER in markers:
+            self.logger.info("Remote-Backup erstellt: %s", backup_path)
+            self.logger.info("Parameter per sed aktualisiert: %s", file_path)
+            return True
+        if FAST_SKIP_MARKER not in markers:
+            self.logger.warning(
+                "sed-Aktualisierung fehlgeschlagen für %s: %s", file_path, stderr
+            )
+        return None
+
     def update_remote_parameters(
         self, server_name: str, customer_name: str, new_parameters: Dict[str, Any]
     ) -> bool:
@@ -248,116 +710,346 @@ class SSHManager:
             remote_path = customer_config["parameters_path"]
 
             self.logger.info(
-                f"Aktualisiere {customer_name} auf {server_name}: {remote_path}"
+                "Aktualisiere %s auf %s: %s", customer_name, server_name, remote_path
             )
 
-            # 1. Aktuelle Berechtigungen speichern
-            permissions = self.get_file_permissions(server_name, remote_path)
+            # Einzelner skalarer Parameter: direkt per sed ersetzen
+            fast_path = self._fast_path_command(remote_path, new_parameters)
+            if fast_path:
+                command, backup_path = fast_path
+                stdout, stderr, _ = self.execute_remote_command(server_name, command)
+                result = self._check_fast_path_output(
+                    remote_path, backup_path, stdout, stderr
+                )
+                if result is not None:
+                    return result
+
+            # 1. + 2. Aktuelle Berechtigungen speichern und Remote-Backup erstellen
+            permissions, backup_path = self._prepare_remote(server_name, remote_path)
             if not permissions:
                 self.logger.warning(
                     "Konnte Berechtigungen nicht ermitteln, fahre trotzdem fort..."
                 )
 
-            # 2. Remote-Backup erstellen
-            backup_path = self.create_remote_backup(server_name, remote_path)
-
-            # 3. Datei herunterladen
-            with tempfile.NamedTemporaryFile(
-                mode="w+", suffix=".yml", delete=False
-            ) as temp_file:
-                temp_path = temp_file.name
+            # 3. - 5. Datei per SFTP in den Speicher laden, bearbeiten, zurückschreiben
+            with self._borrow(server_name) as ssh, self._sftp_session(ssh) as sftp:
+                buffer = io.BytesIO()
+                try:
+                    sftp.getfo(remote_path, buffer)
+                except Exception as e:
+                    self.logger.error(
+                        "Fehler beim Herunterladen von %s: %s", remote_path, e
+                    )
+                    return False
 
-            if not self.download_file(server_name, remote_path, temp_path):
-                return False
+                original = buffer.getvalue()
+                updated = self.updater.update_parameters_bytes(original, new_parameters)
+                if updated is None:
+                    return False
 
-            # 4. Lokal bearbeiten
-            success = self.updater.update_parameters(
-                temp_path, new_parameters, create_backup=False
-            )
-            if not success:
-                os.unlink(temp_path)
-                return False
+                if updated == original:
+                    self.logger.info(
+                        "Keine Änderungen für %s auf %s", customer_name, server_name
+                    )
+                    return True
 
-            # 5. Zurück hochladen
-            if not self.upload_file(server_name, temp_path, remote_path):
-                os.unlink(temp_path)
-                return False
+                try:
+                    sftp.putfo(io.BytesIO(updated), remote_path)
+                except Exception as e:
+                    self.logger.error(
+                        "Fehler beim Hochladen nach %s: %s", remote_path, e
+                    )
+                    return False
 
             # 6. Berechtigungen wiederherstellen
             if permissions:
                 self.restore_file_permissions(server_name, remote_path, permissions)
 
-            # 7. Temporäre Datei löschen
-            os.unlink(temp_path)
-
             self.logger.info(
-                f"Parameter erfolgreich aktualisiert: {customer_name} auf {server_name}"
+                "Parameter erfolgreich aktualisiert: %s auf %s",
+                customer_name,
+                server_name,
             )
             return True
 
         except Exception as e:
-            self.logger.error(f"Fehler beim Aktualisieren von {customer_name}: {e}")
+            self.logger.error("Fehler beim Aktualisieren von %s: %s", customer_name, e)
             return False
 
     def list_all_customers(self) -> Dict[str, Dict[str, Any]]:
         """Listet alle Kunden aus der Konfiguration auf."""
-        all_customers = {}
-
-        for server_name, server_config in self.config["servers"].items():
-            for customer_name, customer_config in server_config["customers"].items():
-                full_name = f"{server_name}:{customer_name}"
-                all_customers[full_name] = {
-                    "server": server_name,
-                    "customer": customer_name,
-                    "path": customer_config["parameters_path"],
-                    "description": customer_config.get("description", ""),
-                    "host": server_config["host"],
-                }
-
-        return all_customers
+        return {
+            f"{server_name}:{customer_name}": {
+                "server": server_name,
+                "customer": customer_name,
+                "path": customer_config["parameters_path"],
+                "description": customer_config.get("description", ""),
+                "host": server_config["host"],
+            }
+            for server_name, customer_name, server_config, customer_config in (
+                self._customer_index
+            )
+        }
 
-    def bulk_update_parameter(
-        self, targets: List[str], parameter_name: str, parameter_value: Any
+    def _update_server(
+        self, server_name: str, customers: List[Tuple[str, str, Dict[str, Any]]]
     ) -> Dict[str, bool]:
-        """Führt Bulk-Update für mehrere Kunden durch."""
+        """Aktualisiert alle Kunden eines Servers über eine einzige Verbindung."""
         results = {}
 
-        # Spezialbehandlung für Secret-Generierung
-        if parameter_value == "GENERATE_NEW" and parameter_name == "secret":
-            # Für jeden Kunden einen eigenen Secret generieren
-            for target in targets:
-                if ":" in target:
-                    server_name, customer_name = target.split(":", 1)
-                    new_secret = self.generate_secret()
+        try:
+            with self._server_session(server_name):
+                for target, customer_name, parameters in customers:
                     results[target] = self.update_remote_parameters(
-                        server_name, customer_name, {parameter_name: new_secret}
+                        server_name, customer_name, parameters
                     )
-                else:
-                    results[target] = False
-        else:
-            # Normales Bulk-Update
-            for target in targets:
-                if ":" in target:
-                    server_name, customer_name = target.split(":", 1)
-                    results[target] = self.update_remote_parameters(
-                        server_name, customer_name, {parameter_name: parameter_value}
+        except Exception as e:
+            self.logger.error("Verbindung zu %s fehlgeschlagen: %s", server_name, e)
+
+        for target, _, _ in customers:
+            results.setdefault(target, False)
+        return results
+
+    def _group_targets(
+        self, target_parameters: Dict[str, Dict[str, Any]]
+    ) -> Dict[str, List[Tuple[str, str, Dict[str, Any]]]]:
+        """Gruppiert gültige Ziele (server:kunde) nach Server."""
+        groups: Dict[str, List[Tuple[str, str, Dict[str, Any]]]] = defaultdict(list)
+        for target, parameters in target_parameters.items():
+            if ":" not in target:
+                continue
+            server_name, customer_name = target.split(":", 1)
+            if server_name not in self.config["servers"]:
+                continue
+            groups[server_name].append((target, customer_name, parameters))
+        return groups
+
+    def _async_connect_params(self, server_name: str) -> Dict[str, Any]:
+        """Verbindungsparameter für asyncssh.connect."""
+        resolved = self._resolved_server_params[server_name]
+
+        connect_params = {
+            "host": resolved["hostname"],
+            "port": resolved["port"],
+            "username": resolved["username"],
+            "connect_timeout": resolved["timeout"],
+            # Entspricht AutoAddPolicy der paramiko-Verbindungen
+            "known_hosts": None,
+        }
+
+        if "key_filename" in resolved:
+            connect_params["client_keys"] = [resolved["key_filename"]]
+
+        if "password" in resolved:
+            connect_params["password"] = resolved["password"]
+
+        return connect_params
+
+    async def _update_remote_async(
+        self,
+        conn: Any,
+        server_name: str,
+        customer_name: str,
+        new_parameters: Dict[str, Any],
+    ) -> bool:
+        """Asynchrone Variante von update_remote_parameters."""
+        try:
+            remote_path = self.config["servers"][server_name]["customers"][
+                customer_name
+            ]["parameters_path"]
+            self.logger.info(
+                "Aktualisiere %s auf %s: %s", customer_name, server_name, remote_path
+            )
+
+            fast_path = self._fast_path_command(remote_path, new_parameters)
+            if fast_path:
+                command, backup_path = fast_path
+                result = await conn.run(command)
+                outcome = self._check_fast_path_output(
+                    remote_path, backup_path, result.stdout, result.stderr
+                )
+                if outcome is not None:
+                    return outcome
+
+            command, backup_path = self._prepare_command(remote_path)
+            result = await conn.run(command)
+            permissions, _ = self._parse_prepare_output(
+                remote_path, backup_path, result.stdout, result.stderr
+            )
+
+            async with conn.start_sftp_client() as sftp:
+                async with sftp.open(remote_path, "rb") as f:
+                    original = await f.read()
+
+                updated = self.updater.update_parameters_bytes(original, new_parameters)
+                if updated is None:
+                    return False
+
+                if updated == original:
+                    self.logger.info(
+                        "Keine Änderungen für %s auf %s", customer_name, server_name
                     )
-                else:
-                    results[target] = False
+                    return True
+
+                async with sftp.open(remote_path, "wb") as f:
+                    await f.write(updated)
+
+            if permissions:
+                result = await conn.run(self._restore_command(remote_path, permissions))
+                self._check_restore_output(
+                    remote_path, result.stdout, result.stderr, result.exit_status
+                )
+
+            self.logger.info(
+                "Parameter erfolgreich aktualisiert: %s auf %s",
+                customer_name,
+                server_name,
+            )
+            return True
+
+        except Exception as e:
+            self.logger.error("Fehler beim Aktualisieren von %s: %s", customer_name, e)
+            return False
 
+    async def _bulk_update_async(
+        self, groups: Dict[str, List[Tuple[str, str, Dict[str, Any]]]]
+    ) -> Dict[str, bool]:
+        """
+        Aktualisiert alle Ziele über asyncssh. Pro Server wird eine Verbindung
+        aufgebaut. Ein Semaphor begrenzt die Sitzungen insgesamt, ein weiteres
+        pro Verbindung die Kanäle, damit MaxSessions des Servers nicht
+        überschritten wird.
+        """
+        asyncssh = _get_asyncssh()
+        semaphore = asyncio.Semaphore(self.async_concurrency)
+
+        async def update_target(
+            conn, sessions, server_name, target, customer_name, params
+        ):
+            # Erst den Kanal der Verbindung, dann den globalen Platz belegen,
+            # damit wartende Kunden keine globalen Plätze blockieren
+            async with sessions, semaphore:
+                outcome = await self._update_remote_async(
+                    conn, server_name, customer_name, params
+                )
+            return target, outcome
+
+        async def update_server(server_name, customers):
+            try:
+                async with asyncssh.connect(
+                    **self._async_connect_params(server_name)
+                ) as conn:
+                    sessions = asyncio.Semaphore(self.max_sessions)
+                    outcomes = await asyncio.gather(
+                        *(
+                            update_target(
+                                conn, sessions, server_name, target, customer, params
+                            )
+                            for target, customer, params in customers
+                        )
+                    )
+                    return dict(outcomes)
+            except Exception as e:
+                self.logger.error(
+                    "SSH-Verbindung fehlgeschlagen für %s: %s", server_name, e
+                )
+                return {target: False for target, _, _ in customers}
+
+        results = {}
+        for server_results in await asyncio.gather(
+            *(update_server(name, customers) for name, customers in groups.items())
+        ):
+            results.update(server_results)
+        return results
+
+    def _iter_update_targets(
+        self, target_parameters: Dict[str, Dict[str, Any]]
+    ) -> Iterator[Dict[str, bool]]:
+        """
+        Aktualisiert mehrere Ziele und liefert die Ergebnisse jedes Servers,
+        sobald dieser fertig ist. Ungültige Ziele werden vorab als
+        fehlgeschlagen gemeldet.
+        """
+        groups = self._group_targets(target_parameters)
+        grouped = {
+            target for customers in groups.values() for target, _, _ in customers
+        }
+        invalid = {
+            target: False for target in target_parameters if target not in grouped
+        }
+        if invalid:
+            yield invalid
+        if not groups:
+            return
+
+        if self.use_async:
+            yield asyncio.run(self._bulk_update_async(groups))
+            return
+
+        workers = max(1, min(self.max_workers, len(groups)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(self._update_server, server_name, customers)
+                for server_name, customers in groups.items()
+            ]
+            for future in as_completed(futures):
+                yield future.result()
+
+    def _update_targets(
+        self, target_parameters: Dict[str, Dict[str, Any]]
+    ) -> Dict[str, bool]:
+        """
+        Aktualisiert mehrere Ziele. Die Ziele werden pro Server gruppiert, die
+        Server parallel über einen Thread-Pool abgearbeitet.
+        """
+        results = {target: False for target in target_parameters}
+        for server_results in self._iter_update_targets(target_parameters):
+            results.update(server_results)
         return results
 
+    def _bulk_target_parameters(
+        self, targets: List[str], parameter_name: str, parameter_value: Any
+    ) -> Dict[str, Dict[str, Any]]:
+        """Ordnet jedem Ziel die zu setzenden Parameter zu."""
+        # Spezialbehandlung für Secret-Generierung
+        if parameter_value == "GENERATE_NEW" and parameter_name == "secret":
+            # Für jeden Kunden einen eigenen Secret generieren
+            return {
+                target: {parameter_name: self.generate_secret()} for target in targets
+            }
+
+        # Normales Bulk-Update
+        return {target: {parameter_name: parameter_value} for target in targets}
+
+    def bulk_update_parameter(
+        self, targets: List[str], parameter_name: str, parameter_value: Any
+    ) -> Dict[str, bool]:
+        """Führt Bulk-Update für mehrere Kunden durch."""
+        return self._update_targets(
+            self._bulk_target_parameters(targets, parameter_name, parameter_value)
+        )
+
+    def iter_bulk_update_parameter(
+        self, targets: List[str], parameter_name: str, parameter_value: Any
+    ) -> Iterator[Dict[str, bool]]:
+        """
+        Führt Bulk-Update durch und liefert die Ergebnisse pro Server, sobald
+        dieser fertig ist (für Fortschrittsanzeigen).
+        """
+        return self._iter_update_targets(
+            self._bulk_target_parameters(targets, parameter_name, parameter_value)
+        )
+
     def generate_secret(self, length: int = 32) -> str:
         """Generiert einen zufälligen Secret-Key."""
-        alphabet = string.ascii_letters + string.digits + "!@#$%^&*"
-        return "".join(secrets.choice(alphabet) for _ in range(length))
+        return random_secret(self._SECRET_ALPHABET, length)
 
     def apply_bulk_template(
         self, template_name: str, targets: List[str]
     ) -> Dict[str, bool]:
         """Wendet eine Bulk-Template auf Ziele an."""
         if template_name not in self.config.get("bulk_templates", {}):
-            self.logger.error(f"Template nicht gefunden: {template_name}")
+            self.logger.error("Template nicht gefunden: %s", template_name)
             return {}
 
         template = self.config["bulk_templates"][template_name]
@@ -369,110 +1061,127 @@ class SSHManager:
                 # Wird in bulk_update_parameter behandelt
                 pass
 
-        results = {}
+        target_parameters = {}
         for target in targets:
-            if ":" in target:
-                server_name, customer_name = target.split(":", 1)
+            # Für jeden Kunden separate Parameter-Kopie (für individuelle Secrets)
+            target_params = parameters.copy()
+            for key, value in target_params.items():
+                if value == "GENERATE_NEW" and key == "secret":
+                    target_params[key] = self.generate_secret()
+            target_parameters[target] = target_params
 
-                # Für jeden Kunden separate Parameter-Kopie (für individuelle Secrets)
-                target_params = parameters.copy()
-                for key, value in target_params.items():
-                    if value == "GENERATE_NEW" and key == "secret":
-                        target_params[key] = self.generate_secret()
+        return self._update_targets(target_parameters)
 
-                results[target] = self.update_remote_parameters(
-                    server_name, customer_name, target_params
-                )
-            else:
-                results[target] = False
+    def _download_server_configs(
+        self, server_name: str, downloads: List[Tuple[str, str, str]]
+    ) -> Dict[str, bool]:
+        """Lädt alle Dateien eines Servers über eine Verbindung herunter."""
+        results = {}
+
+        try:
+            with self._server_session(server_name):
+                for target, remote_path, local_path in downloads:
+                    results[target] = self.download_file(
+                        server_name, remote_path, local_path
+                    )
+        except Exception as e:
+            self.logger.error("Download von %s fehlgeschlagen: %s", server_name, e)
 
+        for target, _, _ in downloads:
+            results.setdefault(target, False)
         return results
 
     def download_all_configs(
-        self, output_dir: str = "downloaded_configs"
+        self, output_dir: str = "downloaded_configs", separator: str = "_"
     ) -> Dict[str, bool]:
-        """Lädt alle Parameter-Dateien herunter."""
+        """
+        Lädt alle Parameter-Dateien herunter.
+
+        Args:
+            output_dir: Zielverzeichnis
+            separator: Trennzeichen zwischen Server und Kunde im Dateinamen
+                (<server><separator><kunde>_parameters.yml)
+        """
         os.makedirs(output_dir, exist_ok=True)
-        results = {}
 
-        for server_name, server_config in self.config["servers"].items():
-            for customer_name, customer_config in server_config["customers"].items():
-                remote_path = customer_config["parameters_path"]
-                local_filename = f"{server_name}_{customer_name}_parameters.yml"
-                local_path = os.path.join(output_dir, local_filename)
+        # Downloads pro Server bündeln. Alle Dateien heißen parameters.yml,
+        # daher ein get() pro Datei mit eigenem Zielnamen statt mehrerer
+        # Quellen in einem Aufruf.
+        downloads: Dict[str, List[Tuple[str, str, str]]] = defaultdict(list)
+        for server_name, customer_name, _, customer_config in self._customer_index:
+            remote_path = customer_config["parameters_path"]
+            local_filename = f"{server_name}{separator}{customer_name}_parameters.yml"
+            local_path = os.path.join(output_dir, local_filename)
+
+            target = f"{server_name}:{customer_name}"
+            downloads[server_name].append((target, remote_path, local_path))
 
-                target = f"{server_name}:{customer_name}"
-                results[target] = self.download_file(
-                    server_name, remote_path, local_path
+        if not downloads:
+            return {}
+
+        # Server parallel abarbeiten
+        workers = max(1, min(self.max_workers, len(downloads)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            server_results = list(
+                executor.map(
+                    self._download_server_configs, downloads, downloads.values()
                 )
+            )
 
+        results = {}
+        for server_result in server_results:
+            results.update(server_result)
         return results
 
-    def generate_web_config(self) -> str:
-        """Generiert JSON-Konfiguration für Web-Interface."""
-        web_config = {}
-
-        for server_name, server_config in self.config["servers"].items():
-            for customer_name, customer_config in server_config["customers"].items():
-                full_name = f"{server_name}:{customer_name}"
-                web_config[full_name] = {
-                    "server": server_name,
-                    "customer": customer_name,
-                    "file_path": customer_config["parameters_path"],
-                    "description": customer_config.get("description", ""),
-                    "host": server_config["host"],
-                    "parameters": {},  # Wird beim Laden gefüllt
-                }
+    def generate_web_config(self) -> bytes:
+        """Generiert JSON-Konfiguration für Web-Interface (UTF-8 kodiert)."""
+        web_config = {
+            f"{server_name}:{customer_name}": {
+                "server": server_name,
+                "customer": customer_name,
+                "file_path": customer_config["parameters_path"],
+                "description": customer_config.get("description", ""),
+                "host": server_config["host"],
+                "parameters": {},  # Wird beim Laden gefüllt
+            }
+            for server_name, customer_name, server_config, customer_config in (
+                self._customer_index
+            )
+        }
 
-        return json.dumps(web_config, indent=2, ensure_ascii=False)
+        if orjson is not None:
+            return orjson.dumps(web_config, option=orjson.OPT_INDENT_2)
+        return json.dumps(web_config, indent=2, ensure_ascii=False).encode("utf-8")
 
     def test_connection(self, server_name: str) -> bool:
         """Test SSH connection to a server."""
         try:
             if server_name not in self.config["servers"]:
-                self.logger.error(f"Server {server_name} not found in configuration")
+                self.logger.error("Server %s not found in configuration", server_name)
                 return False
 
-            server_config = self.config["servers"][server_name]
-
-            # Create SSH client
-            ssh = paramiko.SSHClient()
-            ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+            # Pooled connection: only the first test pays for the handshake,
+            # later status checks cost a single command round-trip. The connect
+            # timeout also bounds the command, since a silently dropped pooled
+            # transport still reports is_active().
+            timeout = self._resolved_server_params[server_name]["timeout"]
+            with self._borrow(server_name) as ssh:
+                stdin, stdout, stderr = ssh.exec_command("echo 'test'", timeout=timeout)
+                result = stdout.read().decode().strip()
+                if result != "test":
+                    # Raising makes _borrow discard the connection
+                    raise IOError(f"Unexpected test output: {result!r}")
 
-            # Connection parameters
-            connect_params = {
-                "hostname": server_config["host"],
-                "port": server_config.get("port", 22),
-                "username": server_config["username"],
-                "timeout": self.config.get("ssh_settings", {}).get("timeout", 30),
-            }
-
-            # Add authentication
-            if "password" in server_config:
-                connect_params["password"] = server_config["password"]
-            elif "ssh_key" in server_config:
-                key_path = os.path.expanduser(server_config["ssh_key"])
-                if os.path.exists(key_path):
-                    connect_params["key_filename"] = key_path
-
-            # Test connection
-            ssh.connect(**connect_params)
-
-            # Test with a simple command
-            stdin, stdout, stderr = ssh.exec_command("echo 'test'")
-            result = stdout.read().decode().strip()
-
-            ssh.close()
-
-            return result == "test"
+            return True
 
         except Exception as e:
-            self.logger.error(f"Connection test failed for {server_name}: {e}")
+            self.logger.error("Connection test failed for %s: %s", server_name, e)
             return False
 
 
-def main():
-    """Hauptfunktion für Command-Line Interface."""
+@functools.lru_cache(maxsize=1)
+def _get_parser() -> argparse.ArgumentParser:
+    """Erstellt den Argument-Parser (einmalig pro Prozess)."""
     parser = argparse.ArgumentParser(
         description="SSH Remote Manager für Symfony Parameters.yml",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -486,6 +1195,9 @@ Beispiele:
   
   # Bulk-Template anwenden
   python ssh_manager.py --template database_migration --targets production:kunde1 production:kunde2
+
+  # Viele Kunden asynchron über asyncssh aktualisieren
+  python ssh_manager.py --async --template database_migration --targets production:kunde1 production:kunde2
   
   # Alle Konfigurationen herunterladen
   python ssh_manager.py --download-all
@@ -526,6 +1238,24 @@ Beispiele:
         action="store_true",
         help="Web-Konfiguration generieren",
     )
+    parser.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help="Bulk-Operationen asynchron über asyncssh ausführen",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=100,
+        help="Maximale gleichzeitige Sitzungen im --async Modus (default: 100)",
+    )
+    parser.add_argument(
+        "--max-sessions",
+        type=int,
+        default=10,
+        help="Maximale Kanäle pro Verbindung im --async Modus (default: 10)",
+    )
     parser.add_argument(
         "--log-level",
         default="INFO",
@@ -533,10 +1263,22 @@ Beispiele:
         help="Log-Level (default: INFO)",
     )
 
+    return parser
+
+
+def main():
+    """Hauptfunktion für Command-Line Interface."""
+    parser = _get_parser()
     args = parser.parse_args()
 
     try:
-        manager = SSHManager(args.config, args.log_level)
+        manager = SSHManager(
+            args.config,
+            args.log_level,
+            use_async=args.use_async,
+            async_concurrency=args.concurrency,
+            max_sessions=args.max_sessions,
+        )
 
         # Alle Kunden auflisten
         if args.list:
@@ -563,7 +1305,7 @@ Beispiele:
                 parameters[key.strip()] = value.strip()
 
             print(f"\n🔄 Aktualisiere Parameter für {len(args.update)} Kunden...")
-            results = {}
+            target_parameters = {}
 
             for target in args.update:
                 if ":" not in target:
@@ -572,10 +1314,9 @@ Beispiele:
                     )
                     continue
 
-                server_name, customer_name = target.split(":", 1)
-                results[target] = manager.update_remote_parameters(
-                    server_name, customer_name, parameters
-                )
+                target_parameters[target] = parameters
+
+            results = manager._update_targets(target_parameters)
 
             print("\n📊 Ergebnisse:")
             for target, success in results.items():
@@ -609,7 +1350,7 @@ Beispiele:
             print("\n🌐 Generiere Web-Konfiguration...")
             web_config = manager.generate_web_config()
 
-            with open("ssh_web_config.json", "w", encoding="utf-8") as f:
+            with open("ssh_web_config.json", "wb") as f:
                 f.write(web_config)
 
             print("✅ Web-Konfiguration gespeichert in: ssh_web_config.json")
@@ -634,7 +1375,8 @@ Beispiele:
         sys.exit(1)
     finally:
         try:
-            manager.close_all_connections()
+            # Programmende: Sockets direkt schließen
+            manager.close_all_connections(fast=True)
         except:
             pass
 
@@ -0,0 +1,23 @@
+"""
+Shared pytest configuration for the test suite.
+"""
+
+import os
+import sys
+
+import pytest
+
+# Make the top-level modules importable, ahead of any installed copy
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+
+@pytest.fixture(scope="session")
+def client():
+    """Create one Flask test client shared by all pytest-style tests."""
+    from web_server import app
+
+    app.config["TESTING"] = True
+    with app.test_client() as client:
+        yield client
@@ -0,0 +1,21 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the requests made during automatic initialization.
+
+These are excluded from the default test run; ``make bench`` runs them and
+fails when the median latency is more than twice the last saved run.
+"""
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+
+# The shared ``client`` fixture comes from tests/conftest.py
+@pytest.mark.parametrize("path", ["/", "/api/status", "/api/customers"])
+def test_initialization_request(benchmark, client, path):
+    """Benchmark one request the page sends while initializing."""
+    response = benchmark(client.get, path)
+
+    # Accept both success and SSH failure status codes like other tests
+    assert response.status_code in (200, 500)
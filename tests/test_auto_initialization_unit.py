@@ -6,179 +6,229 @@ without requiring a full browser environment.
 """
 
 import unittest
-import json
+import re
 from unittest.mock import patch, MagicMock, Mock
-import sys
 import os
-import tempfile
-
-# Add parent directory to path for imports
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-# Add parent directory to path to import web_server
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
 
+# The repository root is put on sys.path by tests/conftest.py
 try:
     from web_server import app
 
     app.config["TESTING"] = True
-    app.config["SSH_CONFIG_FILE"] = tempfile.mktemp()  # Use temp file for tests
 except ImportError:
     app = None
 
 
+def compile_needles(needles):
+    """Compile literal needles into one pattern that finds them in a single scan."""
+    # The lookahead matches at every position, so overlapping needles count too
+    return re.compile(b"(?=(%s))" % b"|".join(map(re.escape, needles)))
+
+
+def find_present(html_content, pattern):
+    """Return the needles of a compiled needle pattern that occur in the HTML."""
+    return set(pattern.findall(html_content))
+
+
+INTERFACE_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "ssh_web_interface.html",
+)
+
+# Declarations and elements the automatic initialization relies on
+REQUIRED_GLOBALS = (
+    (b"editor", b"null"),
+    (b"currentCustomer", b"null"),
+    (b"originalContent", b"''"),
+    (b"isDarkTheme", b"true"),
+    (b"customers", b"[]"),
+    (b"yamlLib", b"null"),
+    (b"currentView", b"'vscode'"),
+    (b"classicSelectedCustomers", b"new Set()"),
+    (b"classicCurrentCustomer", b"null"),
+)
+REQUIRED_FUNCTIONS = (
+    b"loadSystemStatus",
+    b"loadCustomers",
+    b"setupClassicEventListeners",
+    b"loadClassicView",
+    b"switchView",
+    b"showStatus",
+    b"showClassicStatus",
+)
+STATUS_ELEMENTS = (
+    b"total-customers",
+    b"connected-servers",
+    b"selected-customers",
+    b"classic-total-customers",
+    b"classic-connected-servers",
+    b"customers-container",
+    b"customer-selector",
+)
+
+# Only the required names are captured, so other ids and functions never match
+_ID_RE = re.compile(rb'id="(%s)"' % b"|".join(map(re.escape, STATUS_ELEMENTS)))
+_FUNCTION_RE = re.compile(
+    rb"function\s+(%s)\s*\(" % b"|".join(map(re.escape, REQUIRED_FUNCTIONS))
+)
+_LET_RE = re.compile(rb"let\s+(\w+)\s*=\s*([^;\n]*);")
+
+# Literal snippets, compiled once at import
+ERROR_HANDLING = (b"try {", b"catch (error)", b"showStatus('error'")
+API_ENDPOINTS = (b"/api/status", b"/api/customers")
+MODERN_JS_FEATURES = (
+    b"fetch(",
+    b"loadSystemStatus",
+    b"loadCustomers",
+    b"DOMContentLoaded",
+)
+
+# Fields the initialization reads from the API responses
+_REQUIRED_STATUS_FIELDS = frozenset({"total_customers", "servers"})
+_REQUIRED_CUSTOMER_FIELDS = frozenset(
+    {"server", "customer", "path", "description", "host"}
+)
+
+# Canned SSH manager data; read-only, so the tests can share it
+_CONNECTION_STATUS = MappingProxyType(
+    {
+        "tennis-software.de": {
+            "connected": True,
+            "customers": ("test", "tsv-deizisau"),
+        }
+    }
+)
+_ALL_CUSTOMERS = MappingProxyType(
+    {
+        "tennis-software.de:test": {
+            "server": "tennis-software.de",
+            "customer": "test",
+            "path": "/var/www/test/app/config/parameters.yml",
+            "description": "Test Customer",
+            "host": "192.168.1.100",
+        }
+    }
+)
+_PARTIAL_CONNECTION_STATUS = MappingProxyType(
+    {
+        "server1": {"connected": True},
+        "server2": None,  # Corrupted data
+    }
+)
+_PARTIAL_CUSTOMERS = MappingProxyType(
+    {
+        "server1:customer1": {
+            "server": "server1",
+            "customer": "customer1",
+            # Missing some fields
+        }
+    }
+)
+
+# Body of the Monaco loader callback, up to the first "});"
+_MONACO_RE = re.compile(
+    rb"require\(\['vs/editor/editor\.main'\], function \(\)(.*?)\}\);", re.DOTALL
+)
+
+_ERRORS_RE = compile_needles(ERROR_HANDLING)
+_ENDPOINTS_RE = compile_needles(API_ENDPOINTS)
+_FEATURES_RE = compile_needles(MODERN_JS_FEATURES)
+
+
 class TestInitializationJavaScriptLogic(unittest.TestCase):
     """Unit tests for JavaScript initialization logic."""
 
-    def setUp(self):
-        """Set up test environment."""
-        self.client = app.test_client()
+    @classmethod
+    def setUpClass(cls):
+        """Read the interface once; every test only inspects its markup."""
+        # "/" serves this file unchanged, so no request needs to be rendered.
+        # The needles are ASCII, so the raw bytes are searched without decoding
+        with open(INTERFACE_FILE, "rb") as f:
+            cls.html = f.read()
+        # Index ids, function names and let declarations in one pass each
+        cls.ids = set(_ID_RE.findall(cls.html))
+        cls.functions = set(_FUNCTION_RE.findall(cls.html))
+        cls.global_declarations = set(_LET_RE.findall(cls.html))
 
     def test_dom_content_loaded_event_structure(self):
         """Test that the HTML contains the correct DOMContentLoaded event listener."""
-        response = self.client.get("/")
-        html_content = response.data.decode("utf-8")
+        html_content = self.html
 
         # Check that DOMContentLoaded event listener is present
         self.assertIn(
-            "document.addEventListener('DOMContentLoaded'",
+            b"document.addEventListener('DOMContentLoaded'",
             html_content,
             "DOMContentLoaded event listener should be present",
         )
 
         # Check that loadSystemStatus is called in the event listener
         self.assertIn(
-            "loadSystemStatus();",
+            b"loadSystemStatus();",
             html_content,
             "loadSystemStatus should be called in DOMContentLoaded",
         )
 
         # Check that setupClassicEventListeners is called
         self.assertIn(
-            "setupClassicEventListeners();",
+            b"setupClassicEventListeners();",
             html_content,
             "setupClassicEventListeners should be called in DOMContentLoaded",
         )
 
     def test_monaco_editor_callback_structure(self):
         """Test that Monaco Editor callback still includes loadSystemStatus."""
-        response = self.client.get("/")
-        html_content = response.data.decode("utf-8")
+        html_content = self.html
 
         # Check that require callback includes loadSystemStatus
-        monaco_callback_start = html_content.find(
-            "require(['vs/editor/editor.main'], function ()"
+        match = _MONACO_RE.search(html_content)
+        self.assertIsNotNone(match, "Monaco Editor callback not found in HTML")
+        self.assertIn(
+            b"loadSystemStatus();",
+            match.group(1),
+            "Monaco callback should also call loadSystemStatus",
         )
-        monaco_callback_end = html_content.find("});", monaco_callback_start)
 
-        if monaco_callback_start != -1 and monaco_callback_end != -1:
-            monaco_callback = html_content[monaco_callback_start:monaco_callback_end]
-            self.assertIn(
-                "loadSystemStatus();",
-                monaco_callback,
-                "Monaco callback should also call loadSystemStatus",
-            )
-        else:
-            self.fail("Monaco Editor callback not found in HTML")
+    def assert_all_present(self, html_content, needles, pattern, description):
+        """Assert that every needle occurs in the HTML."""
+        self.assert_all_in(needles, find_present(html_content, pattern), description)
+
+    def assert_all_in(self, required, available, description):
+        """Assert that every required item is in the given set."""
+        missing = [item for item in required if item not in available]
+        self.assertFalse(missing, f"{description} missing: {missing}")
 
     def test_global_variables_initialization(self):
         """Test that global variables are properly declared."""
-        response = self.client.get("/")
-        html_content = response.data.decode("utf-8")
-
-        required_globals = [
-            "let editor = null;",
-            "let currentCustomer = null;",
-            "let originalContent = '';",
-            "let isDarkTheme = true;",
-            "let customers = [];",
-            "let yamlLib = null;",
-            "let currentView = 'vscode';",
-            "let classicSelectedCustomers = new Set();",
-            "let classicCurrentCustomer = null;",
-        ]
-
-        for global_var in required_globals:
-            self.assertIn(
-                global_var,
-                html_content,
-                f"Global variable '{global_var}' should be declared",
-            )
+        self.assert_all_in(
+            REQUIRED_GLOBALS, self.global_declarations, "Global variables"
+        )
 
     def test_function_definitions_present(self):
         """Test that all required functions are defined in the HTML."""
-        response = self.client.get("/")
-        html_content = response.data.decode("utf-8")
-
-        required_functions = [
-            "function loadSystemStatus()",
-            "function loadCustomers()",
-            "function setupClassicEventListeners()",
-            "function loadClassicView()",
-            "function switchView(",
-            "function showStatus(",
-            "function showClassicStatus(",
-        ]
-
-        for func in required_functions:
-            self.assertIn(func, html_content, f"Function '{func}' should be defined")
+        self.assert_all_in(REQUIRED_FUNCTIONS, self.functions, "Functions")
 
     def test_css_elements_for_status_display(self):
         """Test that CSS elements for status display are present."""
-        response = self.client.get("/")
-        html_content = response.data.decode("utf-8")
-
         # Check for status display elements
-        status_elements = [
-            'id="total-customers"',
-            'id="connected-servers"',
-            'id="selected-customers"',
-            'id="classic-total-customers"',
-            'id="classic-connected-servers"',
-            'id="customers-container"',
-            'id="customer-selector"',
-        ]
-
-        for element in status_elements:
-            self.assertIn(
-                element,
-                html_content,
-                f"Status element '{element}' should be present in HTML",
-            )
+        self.assert_all_in(STATUS_ELEMENTS, self.ids, "Status elements")
 
     def test_error_handling_structure(self):
         """Test that error handling structure is present in JavaScript."""
-        response = self.client.get("/")
-        html_content = response.data.decode("utf-8")
+        html_content = self.html
 
-        # Check for try-catch blocks in critical functions
-        self.assertIn(
-            "try {", html_content, "Try-catch error handling should be present"
-        )
-        self.assertIn(
-            "catch (error)", html_content, "Error catching should be implemented"
-        )
-
-        # Check for error status display
-        self.assertIn(
-            "showStatus('error'",
-            html_content,
-            "Error status display should be implemented",
+        # Check for try-catch blocks and the error status display
+        self.assert_all_present(
+            html_content, ERROR_HANDLING, _ERRORS_RE, "Error handling"
         )
 
     def test_fetch_api_usage(self):
         """Test that fetch API is used correctly for initialization."""
-        response = self.client.get("/")
-        html_content = response.data.decode("utf-8")
+        html_content = self.html
 
         # Check for API endpoints (adjust based on actual implementation)
-        api_endpoints = ["/api/status", "/api/customers"]
-
-        # Look for fetch usage in general
-        found_endpoints = 0
-        for endpoint in api_endpoints:
-            if endpoint in html_content:
-                found_endpoints += 1
+        found_endpoints = len(find_present(html_content, _ENDPOINTS_RE))
 
         # At least one endpoint should be found
         self.assertGreaterEqual(
@@ -186,17 +236,7 @@ class TestInitializationJavaScriptLogic(unittest.TestCase):
         )
 
         # Check for modern JavaScript features used in initialization
-        modern_js_features = [
-            "fetch(",
-            "loadSystemStatus",
-            "loadCustomers",
-            "DOMContentLoaded",
-        ]
-
-        found_features = 0
-        for feature in modern_js_features:
-            if feature in html_content:
-                found_features += 1
+        found_features = len(find_present(html_content, _FEATURES_RE))
 
         self.assertGreaterEqual(
             found_features,
@@ -208,24 +248,33 @@ class TestInitializationJavaScriptLogic(unittest.TestCase):
 class TestAPIEndpointsForInitialization(unittest.TestCase):
     """Test that API endpoints work correctly for auto-initialization."""
 
-    def setUp(self):
-        """Set up test environment."""
+    @classmethod
+    def setUpClass(cls):
+        """Start the test client, worker pool and SSH manager patch."""
         if app is None:
-            self.skipTest("Flask app not available")
-        self.client = app.test_client()
+            raise unittest.SkipTest("Flask app not available")
+        cls.client = app.test_client()
+        cls.executor = ThreadPoolExecutor(max_workers=3)
+        cls.ssh_manager_patcher = patch("ssh_manager.SSHManager")
+        cls.mock_ssh_manager = cls.ssh_manager_patcher.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        """Stop the shared worker pool and SSH manager patch."""
+        cls.ssh_manager_patcher.stop()
+        cls.executor.shutdown()
 
-    @patch("ssh_manager.SSHManager")
-    def test_status_endpoint_returns_required_data(self, mock_ssh_manager):
+    def setUp(self):
+        """Reset the shared SSH manager mock."""
+        # Drop whatever the previous test configured on the shared mock
+        self.mock_ssh_manager.reset_mock(return_value=True, side_effect=True)
+
+    def test_status_endpoint_returns_required_data(self):
         """Test that /api/status returns all required data for initialization."""
         # Mock SSH manager
         mock_instance = MagicMock()
-        mock_instance.get_connection_status.return_value = {
-            "tennis-software.de": {
-                "connected": True,
-                "customers": ["test", "tsv-deizisau"],
-            }
-        }
-        mock_ssh_manager.return_value = mock_instance
+        mock_instance.get_connection_status.return_value = _CONNECTION_STATUS
+        self.mock_ssh_manager.return_value = mock_instance
 
         try:
             response = self.client.get("/api/status")
@@ -235,14 +284,11 @@ class TestAPIEndpointsForInitialization(unittest.TestCase):
                 self.fail(f"Unexpected status code: {response.status_code}")
 
             if response.status_code == 200:
-                data = json.loads(response.data)
+                data = response.get_json()
 
                 # Check required fields for initialization
-                required_fields = ["total_customers", "servers"]
-                for field in required_fields:
-                    self.assertIn(
-                        field, data, f"Field '{field}' should be in status response"
-                    )
+                missing = _REQUIRED_STATUS_FIELDS - data.keys()
+                self.assertFalse(missing, f"Status response missing: {missing}")
 
                 # Check servers structure
                 self.assertIsInstance(
@@ -262,21 +308,12 @@ class TestAPIEndpointsForInitialization(unittest.TestCase):
             print(f"Expected error in CI environment: {e}")
             self.skipTest("SSH functionality not available in CI")
 
-    @patch("ssh_manager.SSHManager")
-    def test_customers_endpoint_returns_required_data(self, mock_ssh_manager):
+    def test_customers_endpoint_returns_required_data(self):
         """Test that /api/customers returns properly formatted data."""
         # Mock SSH manager
         mock_instance = MagicMock()
-        mock_instance.get_all_customers.return_value = {
-            "tennis-software.de:test": {
-                "server": "tennis-software.de",
-                "customer": "test",
-                "path": "/var/www/test/app/config/parameters.yml",
-                "description": "Test Customer",
-                "host": "192.168.1.100",
-            }
-        }
-        mock_ssh_manager.return_value = mock_instance
+        mock_instance.get_all_customers.return_value = _ALL_CUSTOMERS
+        self.mock_ssh_manager.return_value = mock_instance
 
         try:
             response = self.client.get("/api/customers")
@@ -286,7 +323,7 @@ class TestAPIEndpointsForInitialization(unittest.TestCase):
                 self.fail(f"Unexpected status code: {response.status_code}")
 
             if response.status_code == 200:
-                data = json.loads(response.data)
+                data = response.get_json()
 
                 # Check required structure
                 self.assertIn(
@@ -298,22 +335,10 @@ class TestAPIEndpointsForInitialization(unittest.TestCase):
                 )
 
                 # Check customer data structure
-                if data["customers"]:
-                    first_customer = next(iter(data["customers"].values()))
-                    required_customer_fields = [
-                        "server",
-                        "customer",
-                        "path",
-                        "description",
-                        "host",
-                    ]
-
-                    for field in required_customer_fields:
-                        self.assertIn(
-                            field,
-                            first_customer,
-                            f"Customer should have '{field}' field",
-                        )
+                first_customer = next(iter(data["customers"].values()), None)
+                if first_customer is not None:
+                    missing = _REQUIRED_CUSTOMER_FIELDS - first_customer.keys()
+                    self.assertFalse(missing, f"Customer missing: {missing}")
             else:
                 print("Expected SSH failure in CI environment")
 
@@ -324,21 +349,15 @@ class TestAPIEndpointsForInitialization(unittest.TestCase):
     def test_status_endpoint_error_handling(self):
         """Test error handling in status endpoint."""
         try:
-            with patch("ssh_manager.SSHManager") as mock_ssh_manager:
-                # Mock SSH manager to raise exception
-                mock_ssh_manager.side_effect = Exception("Connection failed")
-
-                response = self.client.get("/api/status")
+            # Mock SSH manager to raise exception
+            self.mock_ssh_manager.side_effect = Exception("Connection failed")
 
-                # Should handle error gracefully (200 with error info or 500)
-                self.assertIn(
-                    response.status_code, [200, 500], "Should handle errors gracefully"
-                )
+            response = self.client.get("/api/status")
 
-                if response.status_code == 200:
-                    data = json.loads(response.data)
-                    # Should have some error indication or empty data
-                    self.assertTrue(True, "Error handled gracefully")
+            # Should handle error gracefully (200 with error info or 500)
+            self.assertIn(
+                response.status_code, [200, 500], "Should handle errors gracefully"
+            )
 
         except Exception as e:
             print(f"Expected error in CI environment: {e}")
@@ -346,167 +365,102 @@ class TestAPIEndpointsForInitialization(unittest.TestCase):
 
     def test_customers_endpoint_error_handling(self):
         """Test error handling in customers endpoint."""
-        with patch("ssh_manager.SSHManager") as mock_ssh_manager:
-            # Mock SSH manager to raise exception
-            mock_ssh_manager.side_effect = Exception("Connection failed")
+        # Mock SSH manager to raise exception
+        self.mock_ssh_manager.side_effect = Exception("Connection failed")
 
-            response = self.client.get("/api/customers")
+        response = self.client.get("/api/customers")
 
-            # Should handle error gracefully
-            self.assertIn(
-                response.status_code, [200, 500], "Should handle errors gracefully"
-            )
+        # Should handle error gracefully
+        self.assertIn(
+            response.status_code, [200, 500], "Should handle errors gracefully"
+        )
 
     def test_concurrent_api_requests(self):
         """Test that API can handle concurrent requests during initialization."""
-        import threading
-        import time
 
-        results = []
-
-        def make_request():
+        def make_request(_):
             try:
-                response = self.client.get("/api/status")
-                results.append(response.status_code)
-            except Exception as e:
-                results.append(500)  # Treat exceptions as 500 errors
+                # The test client is not thread-safe, so every request gets its own
+                return app.test_client().get("/api/status").status_code
+            except Exception:
+                return 500  # Treat exceptions as 500 errors
 
-        try:
-            # Create multiple threads
-            threads = []
-            for _ in range(3):  # Reduce from 5 to 3 for CI stability
-                thread = threading.Thread(target=make_request)
-                threads.append(thread)
-
-            # Start all threads
-            for thread in threads:
-                thread.start()
-
-            # Wait for all threads to complete
-            for thread in threads:
-                thread.join()
-
-            # Check that all requests completed (200 or 500 are both acceptable in CI)
-            for status_code in results:
+        # Reduce from 5 to 3 for CI stability
+        results = list(self.executor.map(make_request, range(3)))
+
+        # Check that all requests completed (200 or 500 are both acceptable in CI)
+        for request_number, status_code in enumerate(results):
+            with self.subTest(request=request_number):
                 self.assertIn(
                     status_code,
                     [200, 500],
                     "All concurrent requests should complete with valid status",
                 )
 
-            # At least some requests should complete
-            self.assertEqual(len(results), 3, "All concurrent requests should complete")
+        # At least some requests should complete
+        self.assertEqual(len(results), 3, "All concurrent requests should complete")
 
-        except Exception as e:
-            print(f"Expected error in CI environment: {e}")
-            self.skipTest("Concurrent requests not testable in CI")
 
+class TestInitializationRobustness(unittest.TestCase):
+    """Test robustness of automatic initialization."""
 
-class TestInitializationTiming(unittest.TestCase):
-    """Test timing aspects of automatic initialization."""
-
-    def setUp(self):
-        """Set up test client."""
+    @classmethod
+    def setUpClass(cls):
+        """Set up the test client and SSH manager patch for all tests."""
         if app is None:
-            self.skipTest("Flask app not available")
-        self.client = app.test_client()
-
-    def test_page_load_performance(self):
-        """Test that page loads quickly despite automatic initialization."""
-        import time
-
-        start_time = time.time()
-        response = self.client.get("/")
-        end_time = time.time()
-
-        load_time = end_time - start_time
-
-        self.assertEqual(response.status_code, 200)
-        self.assertLess(
-            load_time, 2.0, f"Page should load within 2 seconds, took {load_time:.2f}s"
-        )
-
-    def test_api_response_times(self):
-        """Test that API endpoints respond quickly for initialization."""
-        import time
-
-        endpoints = ["/api/status", "/api/customers"]
+            raise unittest.SkipTest("Flask app not available")
+        cls.client = app.test_client()
+        cls.ssh_manager_patcher = patch("ssh_manager.SSHManager")
+        cls.mock_ssh_manager = cls.ssh_manager_patcher.start()
 
-        try:
-            for endpoint in endpoints:
-                start_time = time.time()
-                response = self.client.get(endpoint)
-                end_time = time.time()
-
-                response_time = end_time - start_time
-
-                # Accept both success and error responses in CI
-                self.assertIn(
-                    response.status_code,
-                    [200, 500],
-                    f"{endpoint} should respond with valid status",
-                )
-                self.assertLess(
-                    response_time,
-                    3.0,
-                    f"{endpoint} should respond within 3 seconds, took {response_time:.2f}s",
-                )
-
-        except Exception as e:
-            print(f"Expected error in CI environment: {e}")
-            self.skipTest("API endpoints not available in CI")
-
-
-class TestInitializationRobustness(unittest.TestCase):
-    """Test robustness of automatic initialization."""
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the SSH manager patch."""
+        cls.ssh_manager_patcher.stop()
 
     def setUp(self):
-        """Set up test client."""
-        if app is None:
-            self.skipTest("Flask app not available")
-        self.client = app.test_client()
+        """Reset the shared SSH manager mock."""
+        # Drop whatever the previous test configured on the shared mock
+        self.mock_ssh_manager.reset_mock(return_value=True, side_effect=True)
 
     def test_initialization_with_empty_data(self):
         """Test initialization handles empty data gracefully."""
         try:
-            with patch("ssh_manager.SSHManager") as mock_ssh_manager:
-                # Mock empty data
-                mock_instance = MagicMock()
-                mock_instance.get_connection_status.return_value = {}
-                mock_instance.get_all_customers.return_value = {}
-                mock_ssh_manager.return_value = mock_instance
-
-                # Status endpoint
-                response = self.client.get("/api/status")
-                self.assertIn(
-                    response.status_code,
-                    [200, 500],
-                    "Should handle empty data gracefully",
-                )
+            # Mock empty data
+            mock_instance = MagicMock()
+            mock_instance.get_connection_status.return_value = {}
+            mock_instance.get_all_customers.return_value = {}
+            self.mock_ssh_manager.return_value = mock_instance
 
-                if response.status_code == 200:
-                    data = json.loads(response.data)
-                    self.assertEqual(
-                        data["total_customers"],
-                        0,
-                        "Should handle zero customers gracefully",
-                    )
+            # Status endpoint
+            response = self.client.get("/api/status")
+            self.assertIn(
+                response.status_code,
+                [200, 500],
+                "Should handle empty data gracefully",
+            )
 
-                # Customers endpoint
-                response = self.client.get("/api/customers")
-                self.assertIn(
-                    response.status_code,
-                    [200, 500],
-                    "Should handle empty customer list gracefully",
+            if response.status_code == 200:
+                data = response.get_json()
+                self.assertEqual(
+                    data["total_customers"],
+                    0,
+                    "Should handle zero customers gracefully",
                 )
 
-                if response.status_code == 200:
-                    data = json.loads(response.data)
-                    self.assertEqual(
-                        len(data["customers"]),
-                        0,
-                        "Should handle empty customer list gracefully",
-                    )
+            # Customers endpoint
+            response = self.client.get("/api/customers")
+            self.assertIn(
+                response.status_code,
+                [200, 500],
+                "Should handle empty customer list gracefully",
+            )
+
+            if response.status_code == 200:
+                data = response.get_json()
+                self.assertFalse(
+                    data["customers"], "Should handle empty customer list gracefully"
+                )
 
         except Exception as e:
             print(f"Expected error in CI environment: {e}")
@@ -515,28 +469,20 @@ class TestInitializationRobustness(unittest.TestCase):
     def test_initialization_with_partial_data(self):
         """Test initialization handles partial/corrupted data."""
         try:
-            with patch("ssh_manager.SSHManager") as mock_ssh_manager:
-                # Mock partial data
-                mock_instance = MagicMock()
-                mock_instance.get_connection_status.return_value = {
-                    "server1": {"connected": True},
-                    "server2": None,  # Corrupted data
-                }
-                mock_instance.get_all_customers.return_value = {
-                    "server1:customer1": {
-                        "server": "server1",
-                        "customer": "customer1",
-                        # Missing some fields
-                    }
-                }
-                mock_ssh_manager.return_value = mock_instance
-
-                response = self.client.get("/api/status")
-                self.assertIn(
-                    response.status_code,
-                    [200, 500],
-                    "Should handle partial data gracefully",
-                )
+            # Mock partial data
+            mock_instance = MagicMock()
+            mock_instance.get_connection_status.return_value = (
+                _PARTIAL_CONNECTION_STATUS
+            )
+            mock_instance.get_all_customers.return_value = _PARTIAL_CUSTOMERS
+            self.mock_ssh_manager.return_value = mock_instance
+
+            response = self.client.get("/api/status")
+            self.assertIn(
+                response.status_code,
+                [200, 500],
+                "Should handle partial data gracefully",
+            )
 
         except Exception as e:
             print(f"Expected error in CI environment: {e}")
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Tests for the parameter updater module.
+"""
+
+import pytest
+import os
+import stat
+import sys
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parameter_updater import ParameterUpdater, parameter_keys
+
+SAMPLE_YAML = """# This file is auto-generated during the composer install
+parameters:
+    database_host: localhost
+    database_port: 3306
+    secret: ThisTokenIsNotSoSecretChangeIt
+"""
+
+
+@pytest.fixture
+def updater(tmp_path, monkeypatch):
+    """Create a parameter updater that logs into a temporary directory."""
+    monkeypatch.chdir(tmp_path)
+    updater = ParameterUpdater("INFO")
+    yield updater
+    updater.clear_yaml_cache()
+
+
+@pytest.fixture
+def parameters_file(tmp_path):
+    """Create a sample parameters.yml file."""
+    path = tmp_path / "parameters.yml"
+    path.write_text(SAMPLE_YAML, encoding="utf-8")
+    return str(path)
+
+
+class TestYamlLoading:
+    """Test cases for loading YAML files."""
+
+    def test_load_yaml_file(self, updater, parameters_file):
+        """Test that the parameters are parsed correctly."""
+        content = updater.load_yaml_file(parameters_file)
+
+        assert content["parameters"]["database_host"] == "localhost"
+        assert content["parameters"]["database_port"] == 3306
+
+    def test_load_yaml_file_returns_copy(self, updater, parameters_file):
+        """Test that mutating a loaded result does not affect the cache."""
+        content = updater.load_yaml_file(parameters_file)
+        content["parameters"]["database_host"] = "changed"
+
+        assert (
+            updater.load_yaml_file(parameters_file)["parameters"]["database_host"]
+            == "localhost"
+        )
+
+    def test_load_yaml_file_detects_changes(self, updater, parameters_file):
+        """Test that a modified file is parsed again."""
+        updater.load_yaml_file(parameters_file)
+
+        with open(parameters_file, "a", encoding="utf-8") as f:
+            f.write("    mailer_host: smtp.example.com\n")
+
+        content = updater.load_yaml_file(parameters_file)
+        assert content["parameters"]["mailer_host"] == "smtp.example.com"
+
+    def test_validate_yaml_syntax(self, updater, parameters_file, tmp_path):
+        """Test that valid and invalid YAML are told apart."""
+        invalid_file = tmp_path / "invalid.yml"
+        invalid_file.write_text("parameters:\n  - [unclosed\n", encoding="utf-8")
+
+        assert updater.validate_yaml_syntax(parameters_file) is True
+        assert updater.validate_yaml_syntax(str(invalid_file)) is False
+
+    def test_validate_yaml_syntax_composer_errors(self, updater, tmp_path):
+        """Test that files the loader would reject do not validate."""
+        undefined_alias = tmp_path / "alias.yml"
+        undefined_alias.write_text("parameters:\n    a: *nope\n", encoding="utf-8")
+        two_documents = tmp_path / "documents.yml"
+        two_documents.write_text("parameters: {}\n---\nother: 1\n", encoding="utf-8")
+
+        assert updater.validate_yaml_syntax(str(undefined_alias)) is False
+        assert updater.validate_yaml_syntax(str(two_documents)) is False
+
+
+class TestParameterKeys:
+    """Test cases for listing parameter names without loading the file."""
+
+    def test_parameter_keys(self):
+        """Test that only the top-level keys below parameters are returned."""
+        content = (
+            SAMPLE_YAML
+            + "    mailer:\n        parameters: [nested]\n"
+            + "other:\n    ignored: true\n"
+        )
+
+        assert parameter_keys(content.encode("utf-8")) == [
+            "database_host",
+            "database_port",
+            "secret",
+            "mailer",
+        ]
+
+    def test_parameter_keys_merge_key(self):
+        """Test that keys merged in from an anchor are reported."""
+        content = (
+            b"defaults: &defaults\n    database_host: localhost\n"
+            b"parameters:\n    <<: *defaults\n    secret: abc\n"
+        )
+
+        assert sorted(parameter_keys(content)) == ["database_host", "secret"]
+        assert parameter_keys(b"base: &base {a: 1}\nparameters: *base\n") == ["a"]
+
+    def test_parameter_keys_duplicates(self):
+        """Test that a repeated key is listed once, as in the loaded document."""
+        content = b"parameters:\n  a: 1\n  b: 2\n  a: 3\n"
+
+        assert parameter_keys(content) == ["a", "b"]
+
+    def test_parameter_keys_without_mapping(self):
+        """Test that files without a parameters mapping yield no keys."""
+        assert parameter_keys(b"parameters: [a, b]\n") == []
+        assert parameter_keys(b"other: {a: 1}\n") == []
+
+
+class TestUpdateParameters:
+    """Test cases for updating parameter files."""
+
+    def test_update_parameters(self, updater, parameters_file):
+        """Test that new parameters are merged into the file."""
+        result = updater.update_parameters(
+            parameters_file, {"database_host": "db.example.com"}, create_backup=False
+        )
+
+        assert result is True
+        content = updater.load_yaml_file(parameters_file)
+        assert content["parameters"]["database_host"] == "db.example.com"
+        assert content["parameters"]["database_port"] == 3306
+
+    def test_update_parameters_stats_once(self, updater, parameters_file):
+        """Test that one update only stats the parameters file once."""
+        with patch("parameter_updater.os.stat", wraps=os.stat) as mock_stat:
+            result = updater.update_parameters(
+                parameters_file,
+                {"database_host": "db.example.com"},
+                create_backup=False,
+            )
+
+        assert result is True
+        assert [
+            call for call in mock_stat.call_args_list if call.args[0] == parameters_file
+        ] == [((parameters_file,),)]
+
+    def test_update_parameters_preserves_permissions(self, updater, parameters_file):
+        """Test that the file mode survives the atomic rewrite."""
+        os.chmod(parameters_file, 0o640)
+
+        result = updater.update_parameters(
+            parameters_file, {"database_host": "db.example.com"}, create_backup=False
+        )
+
+        assert result is True
+        assert stat.S_IMODE(os.stat(parameters_file).st_mode) == 0o640
+        assert not any(
+            name.endswith(".tmp")
+            for name in os.listdir(os.path.dirname(parameters_file))
+        )
+
+    def test_update_parameters_dump_error_removes_temp_file(
+        self, updater, parameters_file
+    ):
+        """Test that a value YAML cannot represent leaves no temporary file."""
+        result = updater.update_parameters(
+            parameters_file, {"value": object()}, create_backup=False
+        )
+
+        assert result is False
+        assert os.listdir(os.path.dirname(parameters_file)) == ["parameters.yml"]
+        with open(parameters_file, encoding="utf-8") as f:
+            assert f.read() == SAMPLE_YAML
+
+    def test_backup_keeps_original_content(self, updater, parameters_file):
+        """Test that the backup is not affected by the following update."""
+        result = updater.update_parameters(
+            parameters_file, {"database_host": "db.example.com"}
+        )
+
+        assert result is True
+        backups = [
+            name
+            for name in os.listdir(os.path.dirname(parameters_file))
+            if name.startswith("parameters.yml.backup_")
+        ]
+        assert len(backups) == 1
+        backup_path = os.path.join(os.path.dirname(parameters_file), backups[0])
+        with open(backup_path, encoding="utf-8") as f:
+            assert f.read() == SAMPLE_YAML
+
+    def test_update_parameters_no_changes(self, updater, parameters_file):
+        """Test that an update without changes leaves the file untouched."""
+        mtime_before = os.stat(parameters_file).st_mtime_ns
+
+        result = updater.update_parameters(parameters_file, {"database_port": 3306})
+
+        assert result is True
+        assert os.stat(parameters_file).st_mtime_ns == mtime_before
+        assert not any(
+            name.startswith("parameters.yml.backup_")
+            for name in os.listdir(os.path.dirname(parameters_file))
+        )
+
+    def test_update_parameters_type_change(self, updater, tmp_path):
+        """Test that values equal under == but of another type are written."""
+        path = tmp_path / "parameters.yml"
+        path.write_text(
+            "parameters:\n    debug: 1\n    ratio: 0\n    ports: [1]\n",
+            encoding="utf-8",
+        )
+
+        result = updater.update_parameters(
+            str(path),
+            {"debug": True, "ratio": False, "ports": [True]},
+            create_backup=False,
+        )
+
+        assert result is True
+        content = updater.load_yaml_file(str(path))
+        assert content["parameters"]["debug"] is True
+        assert content["parameters"]["ratio"] is False
+        assert content["parameters"]["ports"] == [True]
+        assert content["parameters"]["ports"][0] is True
+
+    def test_update_parameters_missing_file(self, updater, tmp_path):
+        """Test that a missing file is reported as failure."""
+        result = updater.update_parameters(
+            str(tmp_path / "missing.yml"), {"database_host": "db.example.com"}
+        )
+
+        assert result is False
+
+    def test_update_parameters_bytes(self, updater):
+        """Test that parameters can be updated without touching the disk."""
+        result = updater.update_parameters_bytes(
+            SAMPLE_YAML.encode("utf-8"), {"database_host": "db.example.com"}
+        )
+
+        assert result.startswith(b"# This file is auto-generated")
+        assert b"database_host: db.example.com" in result
+        assert b"database_port: 3306" in result
+
+    def test_update_parameters_bytes_invalid_yaml(self, updater):
+        """Test that invalid YAML content is reported as failure."""
+        assert updater.update_parameters_bytes(b"parameters: [", {"a": "b"}) is None
+
+
+class TestUpdateMultipleServers:
+    """Test cases for updating several servers at once."""
+
+    def test_update_multiple_servers(self, updater, tmp_path):
+        """Test that every server is updated and reported."""
+        server_configs = {}
+        for name in ["production", "staging"]:
+            path = tmp_path / f"{name}.yml"
+            path.write_text(SAMPLE_YAML, encoding="utf-8")
+            server_configs[name] = {
+                "file_path": str(path),
+                "parameters": {"database_host": f"{name}-db.example.com"},
+            }
+        server_configs["broken"] = {"parameters": {"database_host": "x"}}
+
+        results = updater.update_multiple_servers(server_configs)
+
+        assert results == {"production": True, "staging": True, "broken": False}
+        content = updater.load_yaml_file(str(tmp_path / "staging.yml"))
+        assert content["parameters"]["database_host"] == "staging-db.example.com"
+
+    def test_update_multiple_servers_shared_file(self, updater, parameters_file):
+        """Test that servers sharing a file are merged into one update."""
+        server_configs = {
+            "site_a": {
+                "file_path": parameters_file,
+                "parameters": {"database_host": "a.example.com"},
+            },
+            "site_b": {
+                "file_path": parameters_file,
+                "parameters": {"mailer_host": "smtp.example.com"},
+            },
+        }
+
+        with patch.object(
+            updater, "update_parameters", wraps=updater.update_parameters
+        ) as mock_update:
+            results = updater.update_multiple_servers(server_configs)
+
+        assert results == {"site_a": True, "site_b": True}
+        mock_update.assert_called_once()
+        content = updater.load_yaml_file(parameters_file)
+        assert content["parameters"]["database_host"] == "a.example.com"
+        assert content["parameters"]["mailer_host"] == "smtp.example.com"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,836 @@
+#!/usr/bin/env python3
+"""
+Tests for the SSH manager module.
+"""
+
+import pytest
+import asyncio
+from unittest.mock import Mock, patch
+import json
+import os
+import stat
+import string
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ssh_manager import SSHManager, random_secret
+
+SAMPLE_CONFIG = """
+ssh_settings:
+  timeout: 10
+  backup_dir: /tmp/symfony_backups
+
+servers:
+  production:
+    host: prod-server.example.com
+    username: deploy
+    customers:
+      customer1:
+        parameters_path: /var/www/customer1/app/config/parameters.yml
+        description: "Customer 1"
+      customer2:
+        parameters_path: /var/www/customer2/app/config/parameters.yml
+  staging:
+    host: staging-server.example.com
+    port: 2222
+    username: deploy
+    customers:
+      customer3:
+        parameters_path: /var/www/customer3/app/config/parameters.yml
+
+bulk_templates:
+  security_update:
+    parameters:
+      secret: GENERATE_NEW
+      mailer_host: mail.example.com
+"""
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    """Create an SSH manager with a temporary configuration."""
+    monkeypatch.chdir(tmp_path)
+    config_file = tmp_path / "ssh_config.yml"
+    config_file.write_text(SAMPLE_CONFIG, encoding="utf-8")
+    manager = SSHManager(str(config_file), "INFO")
+    yield manager
+    manager.close_all_connections()
+
+
+def make_client(active=True):
+    """Create a mocked SSH client with an (in)active transport."""
+    client = Mock()
+    client.get_transport.return_value.is_active.return_value = active
+    client.open_sftp.return_value.get_channel.return_value.closed = False
+    return client
+
+
+class TestConfigLoading:
+    """Test cases for loading the SSH configuration."""
+
+    def test_load_config_uses_cache(self, manager):
+        """Test that an unchanged configuration is not parsed again."""
+        with patch("ssh_manager.yaml.load") as mock_load:
+            config = manager.load_config()
+
+        mock_load.assert_not_called()
+        assert config == manager.config
+        assert config is not manager.config
+
+    def test_load_config_detects_changes(self, manager, tmp_path):
+        """Test that a modified configuration is parsed again."""
+        config_file = tmp_path / "ssh_config.yml"
+        config_file.write_text(
+            SAMPLE_CONFIG.replace("timeout: 10", "timeout: 300"), encoding="utf-8"
+        )
+
+        assert manager.load_config()["ssh_settings"]["timeout"] == 300
+
+    def test_reload_refreshes_customer_index(self, manager, tmp_path):
+        """Test that reloading the configuration updates the customer index."""
+        config_file = tmp_path / "ssh_config.yml"
+        config_file.write_text(
+            SAMPLE_CONFIG.replace("customer3:", "customer4:"), encoding="utf-8"
+        )
+
+        manager.config = manager.load_config()
+
+        assert "staging:customer4" in manager.list_all_customers()
+        assert "staging:customer3" not in manager.list_all_customers()
+
+    def test_resolved_server_params(self, manager, tmp_path):
+        """Test that connect parameters are resolved once per config load."""
+        key_file = tmp_path / "id_rsa"
+        key_file.write_text("dummy", encoding="utf-8")
+        manager.config["servers"]["staging"]["ssh_key"] = str(key_file)
+
+        resolved = manager._resolve_server_params(manager.config)
+
+        assert manager._resolved_server_params["production"] == {
+            "hostname": "prod-server.example.com",
+            "port": 22,
+            "username": "deploy",
+            "timeout": 10,
+        }
+        assert resolved["staging"]["port"] == 2222
+        assert resolved["staging"]["key_filename"] == str(key_file)
+
+
+class TestLazyImports:
+    """Test cases for deferred SSH dependency imports."""
+
+    def test_parser_is_cached(self):
+        """Test that the argument parser is only built once."""
+        from ssh_manager import _get_parser
+
+        assert _get_parser() is _get_parser()
+
+    def test_import_does_not_load_paramiko(self):
+        """Test that importing the module does not pull in paramiko."""
+        code = "import sys, ssh_manager; print('paramiko' in sys.modules)"
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            capture_output=True,
+            text=True,
+        )
+
+        assert result.stdout.strip() == "False"
+
+
+class TestCustomers:
+    """Test cases for customer listing."""
+
+    def test_list_all_customers(self, manager):
+        """Test that customers of all servers are listed."""
+        customers = manager.list_all_customers()
+
+        assert list(customers) == [
+            "production:customer1",
+            "production:customer2",
+            "staging:customer3",
+        ]
+        assert customers["production:customer1"]["description"] == "Customer 1"
+        assert customers["staging:customer3"]["host"] == "staging-server.example.com"
+
+
+class TestConnectionPool:
+    """Test cases for the SSH connection pool."""
+
+    def test_borrow_reuses_connection(self, manager):
+        """Test that a returned connection is handed out again."""
+        client = make_client()
+        with patch.object(manager, "_connect", return_value=client) as mock_connect:
+            with manager._borrow("production") as first:
+                pass
+            with manager._borrow("production") as second:
+                pass
+
+        assert first is second is client
+        mock_connect.assert_called_once_with("production")
+
+    def test_borrow_opens_second_connection_when_busy(self, manager):
+        """Test that concurrent borrowers get separate connections."""
+        clients = [make_client(), make_client()]
+        with patch.object(manager, "_connect", side_effect=clients):
+            with manager._borrow("production") as first:
+                with manager._borrow("production") as second:
+                    assert first is not second
+
+    def test_borrow_discards_connection_after_error(self, manager):
+        """Test that a connection whose use failed is not pooled again."""
+        client = make_client()
+        with patch.object(manager, "_connect", return_value=client):
+            with pytest.raises(OSError):
+                with manager._borrow("production"):
+                    raise OSError("Socket is closed")
+
+        client.close.assert_called_once()
+        assert manager._pool("production").empty()
+
+    def test_pool_created_once_per_server(self, manager):
+        """Test that concurrent first accesses share one pool per server."""
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            pools = list(executor.map(manager._pool, ["production"] * 32))
+
+        assert all(pool is pools[0] for pool in pools)
+        assert manager._pools == {"production": pools[0]}
+
+    def test_borrow_discards_inactive_connection(self, manager):
+        """Test that dead connections are replaced."""
+        dead, fresh = make_client(active=False), make_client()
+        manager._pool("production").put(dead)
+
+        with patch.object(manager, "_connect", return_value=fresh):
+            with manager._borrow("production") as ssh:
+                assert ssh is fresh
+
+        dead.close.assert_called_once()
+
+    def test_test_connection_reuses_pooled_connection(self, manager):
+        """Test that repeated connection tests share one SSH connection."""
+        client = make_client()
+        client.exec_command.side_effect = lambda command, timeout: (
+            Mock(),
+            Mock(**{"read.return_value": b"test\n"}),
+            Mock(),
+        )
+
+        with patch.object(manager, "_connect", return_value=client) as mock_connect:
+            assert manager.test_connection("production") is True
+            assert manager.test_connection("production") is True
+
+        mock_connect.assert_called_once_with("production")
+        client.exec_command.assert_called_with("echo 'test'", timeout=10)
+
+    def test_test_connection_discards_failed_connection(self, manager):
+        """Test that a connection that timed out is not handed out again."""
+        client = make_client()
+        client.exec_command.side_effect = TimeoutError("timed out")
+
+        with patch.object(manager, "_connect", return_value=client):
+            assert manager.test_connection("production") is False
+
+        client.close.assert_called_once()
+        assert manager._pool("production").empty()
+
+    def test_close_all_connections(self, manager):
+        """Test that every open connection is closed and the pool emptied."""
+        clients = [make_client(), make_client(), make_client()]
+        manager.ssh_connections["production"].extend(clients[:2])
+        manager.ssh_connections["staging"].append(clients[2])
+        manager._pool("production").put(clients[0])
+
+        manager.close_all_connections()
+
+        for client in clients:
+            client.close.assert_called_once()
+        assert not manager.ssh_connections
+        assert not manager._pools
+
+    def test_close_all_connections_fast(self, manager):
+        """Test that a fast close only shuts the sockets down."""
+        client = make_client()
+        manager.ssh_connections["production"].append(client)
+
+        manager.close_all_connections(fast=True)
+
+        client.get_transport.return_value.sock.close.assert_called_once()
+        client.close.assert_not_called()
+
+
+def run_locally(server_name, command):
+    """Execute a "remote" command in a local shell."""
+    result = subprocess.run(command, shell=True, capture_output=True, text=True)
+    return result.stdout, result.stderr, result.returncode
+
+
+class TestRemoteCommands:
+    """Test cases for the combined remote shell commands."""
+
+    def test_prepare_remote(self, manager, tmp_path):
+        """Test that permissions are read and a backup is created at once."""
+        target = tmp_path / "parameters.yml"
+        target.write_text("parameters: {}\n", encoding="utf-8")
+        target.chmod(0o640)
+        manager.config["ssh_settings"]["backup_dir"] = str(tmp_path / "backups")
+
+        with patch.object(
+            manager, "execute_remote_command", side_effect=run_locally
+        ) as mock_exec:
+            permissions, backup_path = manager._prepare_remote(
+                "production", str(target)
+            )
+
+        mock_exec.assert_called_once()
+        assert permissions["permissions"] == "640"
+        assert os.path.exists(backup_path)
+
+    def test_prepare_remote_missing_file(self, manager, tmp_path):
+        """Test that a missing file yields neither permissions nor backup."""
+        manager.config["ssh_settings"]["backup_dir"] = str(tmp_path / "backups")
+
+        with patch.object(manager, "execute_remote_command", side_effect=run_locally):
+            permissions, backup_path = manager._prepare_remote(
+                "production", str(tmp_path / "missing.yml")
+            )
+
+        assert permissions is None
+        assert backup_path is None
+
+    def test_restore_file_permissions(self, manager, tmp_path):
+        """Test that mode and ownership are restored with one command."""
+        target = tmp_path / "parameters.yml"
+        target.write_text("parameters: {}\n", encoding="utf-8")
+        stat_info = os.stat(target)
+        permissions = {
+            "permissions": "600",
+            "owner": str(stat_info.st_uid),
+            "group": str(stat_info.st_gid),
+        }
+
+        with patch.object(
+            manager, "execute_remote_command", side_effect=run_locally
+        ) as mock_exec:
+            result = manager.restore_file_permissions(
+                "production", str(target), permissions
+            )
+
+        assert result is True
+        mock_exec.assert_called_once()
+        assert stat.S_IMODE(os.stat(target).st_mode) == 0o600
+
+
+class TestUpdateRemoteParameters:
+    """Test cases for updating a single remote parameters file."""
+
+    def make_sftp_client(self, content):
+        """Create a mocked SSH client whose SFTP channel serves content."""
+        uploads = []
+        client = make_client()
+        sftp = client.open_sftp.return_value
+        sftp.get_channel.return_value.closed = False
+        sftp.getfo.side_effect = lambda path, fileobj: fileobj.write(content)
+        sftp.putfo.side_effect = lambda fileobj, path: uploads.append(fileobj.read())
+        return client, uploads
+
+    def test_update_remote_parameters(self, manager):
+        """Test that the file is edited in memory and uploaded once."""
+        client, uploads = self.make_sftp_client(
+            b"parameters:\n    database_host: localhost\n"
+        )
+        permissions = {"permissions": "640", "owner": "www", "group": "www"}
+
+        with patch.object(manager, "_connect", return_value=client), patch.object(
+            manager, "_prepare_remote", return_value=(permissions, "/tmp/backup")
+        ), patch.object(
+            manager, "restore_file_permissions", return_value=True
+        ) as mock_restore:
+            result = manager.update_remote_parameters(
+                "production",
+                "customer1",
+                {"database_host": "db.example.com", "mailer_host": "smtp.example.com"},
+            )
+
+        assert result is True
+        assert len(uploads) == 1
+        assert b"database_host: db.example.com" in uploads[0]
+        assert b"mailer_host: smtp.example.com" in uploads[0]
+        mock_restore.assert_called_once_with(
+            "production", "/var/www/customer1/app/config/parameters.yml", permissions
+        )
+
+    def test_update_remote_parameters_unchanged(self, manager):
+        """Test that nothing is uploaded when the value is already set."""
+        client, uploads = self.make_sftp_client(
+            b"parameters:\n    database_host: localhost\n    database_port: 3306\n"
+        )
+
+        with patch.object(manager, "_connect", return_value=client), patch.object(
+            manager, "_prepare_remote", return_value=(None, None)
+        ):
+            result = manager.update_remote_parameters(
+                "production",
+                "customer1",
+                {"database_host": "localhost", "database_port": 3306},
+            )
+
+        assert result is True
+        assert uploads == []
+
+
+class TestSedFastPath:
+    """Test cases for single-parameter updates via sed."""
+
+    @pytest.fixture
+    def remote_file(self, manager, tmp_path):
+        """Point customer1 at a local file and keep backups in tmp_path."""
+        path = tmp_path / "parameters.yml"
+        path.write_text(
+            "# This file is auto-generated during the composer install\n"
+            "parameters:\n"
+            "    database_host: localhost\n"
+            "    database_port: 3306\n",
+            encoding="utf-8",
+        )
+        path.chmod(0o640)
+        customer = manager.config["servers"]["production"]["customers"]["customer1"]
+        customer["parameters_path"] = str(path)
+        manager.config["ssh_settings"]["backup_dir"] = str(tmp_path / "backups")
+        return path
+
+    def update(self, manager, parameters):
+        """Run an update with all remote commands executed locally."""
+        with patch.object(
+            manager, "execute_remote_command", side_effect=run_locally
+        ) as mock_exec, patch.object(
+            manager, "_prepare_remote", return_value=(None, None)
+        ) as mock_prepare, patch.object(
+            manager, "_connect", side_effect=ConnectionError("offline")
+        ):
+            result = manager.update_remote_parameters(
+                "production", "customer1", parameters
+            )
+        return result, mock_exec, mock_prepare
+
+    def test_single_key_is_replaced_in_place(self, manager, remote_file, tmp_path):
+        """Test that one scalar is replaced with a single remote command."""
+        result, mock_exec, mock_prepare = self.update(
+            manager, {"database_host": "db|x&y.example.com"}
+        )
+
+        assert result is True
+        mock_exec.assert_called_once()
+        mock_prepare.assert_not_called()
+        content = remote_file.read_text(encoding="utf-8")
+        assert content.startswith("# This file is auto-generated")
+        assert "    database_host: db|x&y.example.com\n" in content
+        assert "    database_port: 3306\n" in content
+        assert stat.S_IMODE(os.stat(remote_file).st_mode) == 0o640
+        assert len(os.listdir(tmp_path / "backups")) == 1
+
+    def test_unchanged_value_skips_backup(self, manager, remote_file, tmp_path):
+        """Test that an already set value neither rewrites nor backs up."""
+        mtime_before = os.stat(remote_file).st_mtime_ns
+
+        result, _, mock_prepare = self.update(manager, {"database_port": 3306})
+
+        assert result is True
+        mock_prepare.assert_not_called()
+        assert os.stat(remote_file).st_mtime_ns == mtime_before
+        assert not (tmp_path / "backups").exists()
+
+    def test_missing_key_falls_back(self, manager, remote_file):
+        """Test that new keys use the regular download/upload path."""
+        _, _, mock_prepare = self.update(manager, {"mailer_host": "smtp.example.com"})
+
+        mock_prepare.assert_called_once()
+        assert "mailer_host" not in remote_file.read_text(encoding="utf-8")
+
+    def test_nested_values_are_not_eligible(self, manager):
+        """Test that only single flat scalars use the fast path."""
+        path = "/var/www/parameters.yml"
+
+        assert manager._fast_path_command(path, {"a": "1", "b": "2"}) is None
+        assert manager._fast_path_command(path, {"a": {"b": "c"}}) is None
+        assert manager._fast_path_command(path, {"a b": "c"}) is None
+        assert manager._fast_path_command(path, {"a": "x\ny"}) is None
+
+
+class TestBulkUpdate:
+    """Test cases for bulk operations."""
+
+    @pytest.fixture(autouse=True)
+    def connect(self, manager):
+        """Hand out mocked connections instead of connecting."""
+        with patch.object(
+            manager, "_connect", side_effect=lambda server_name: make_client()
+        ) as mock_connect:
+            yield mock_connect
+
+    def test_bulk_update_reuses_connection_per_server(self, manager, connect):
+        """Test that all targets of a server share one connection."""
+        used = []
+
+        def update(server_name, customer_name, parameters):
+            with manager._borrow(server_name) as ssh:
+                used.append((server_name, ssh))
+            with manager._borrow(server_name) as ssh:
+                used.append((server_name, ssh))
+            return True
+
+        with patch.object(manager, "update_remote_parameters", side_effect=update):
+            results = manager.bulk_update_parameter(
+                [
+                    "production:customer1",
+                    "production:customer2",
+                    "staging:customer3",
+                    "unknown:customer4",
+                ],
+                "database_host",
+                "db.example.com",
+            )
+
+        assert results == {
+            "production:customer1": True,
+            "production:customer2": True,
+            "staging:customer3": True,
+            "unknown:customer4": False,
+        }
+        assert connect.call_count == 2
+        assert len({id(ssh) for server, ssh in used if server == "production"}) == 1
+
+    def test_bulk_update_parameter(self, manager):
+        """Test that every valid target is updated."""
+        with patch.object(
+            manager, "update_remote_parameters", return_value=True
+        ) as mock_update:
+            results = manager.bulk_update_parameter(
+                ["production:customer1", "staging:customer3", "invalid"],
+                "database_host",
+                "db.example.com",
+            )
+
+        assert results == {
+            "production:customer1": True,
+            "staging:customer3": True,
+            "invalid": False,
+        }
+        assert mock_update.call_count == 2
+        mock_update.assert_any_call(
+            "staging", "customer3", {"database_host": "db.example.com"}
+        )
+
+    def test_iter_bulk_update_parameter(self, manager):
+        """Test that results arrive per server, invalid targets first."""
+        with patch.object(manager, "update_remote_parameters", return_value=True):
+            batches = list(
+                manager.iter_bulk_update_parameter(
+                    ["production:customer1", "staging:customer3", "invalid"],
+                    "database_host",
+                    "db.example.com",
+                )
+            )
+
+        assert batches[0] == {"invalid": False}
+        assert sorted(batches[1:], key=len) == [
+            {"production:customer1": True},
+            {"staging:customer3": True},
+        ]
+
+    def test_bulk_update_generates_individual_secrets(self, manager):
+        """Test that GENERATE_NEW creates a separate secret per target."""
+        with patch.object(
+            manager, "update_remote_parameters", return_value=True
+        ) as mock_update:
+            manager.bulk_update_parameter(
+                ["production:customer1", "production:customer2"],
+                "secret",
+                "GENERATE_NEW",
+            )
+
+        secrets = [call.args[2]["secret"] for call in mock_update.call_args_list]
+        assert len(secrets) == 2
+        assert secrets[0] != secrets[1]
+        assert "GENERATE_NEW" not in secrets
+
+    def test_apply_bulk_template(self, manager):
+        """Test that template parameters are applied to all targets."""
+        with patch.object(
+            manager, "update_remote_parameters", return_value=True
+        ) as mock_update:
+            results = manager.apply_bulk_template(
+                "security_update", ["production:customer1", "staging:customer3"]
+            )
+
+        assert results == {"production:customer1": True, "staging:customer3": True}
+        for call in mock_update.call_args_list:
+            assert call.args[2]["mailer_host"] == "mail.example.com"
+            assert call.args[2]["secret"] != "GENERATE_NEW"
+
+    def test_apply_unknown_template(self, manager):
+        """Test that an unknown template returns no results."""
+        assert manager.apply_bulk_template("missing", ["production:customer1"]) == {}
+
+
+class FakeAsyncFile:
+    """Local file with the async interface of an asyncssh SFTP file."""
+
+    def __init__(self, path, mode):
+        self.file = open(path, mode)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.file.close()
+
+    async def read(self):
+        return self.file.read()
+
+    async def write(self, data):
+        self.file.write(data)
+
+
+class FakeAsyncConnection:
+    """Connection stand-in that runs commands and SFTP against the local disk."""
+
+    def __init__(self):
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        pass
+
+    async def run(self, command):
+        self.commands.append(command)
+        result = subprocess.run(command, shell=True, capture_output=True, text=True)
+        return Mock(
+            stdout=result.stdout, stderr=result.stderr, exit_status=result.returncode
+        )
+
+    def start_sftp_client(self):
+        return self
+
+    def open(self, path, mode):
+        return FakeAsyncFile(path, mode)
+
+
+class TestAsyncBulkUpdate:
+    """Test cases for the asyncssh based bulk update."""
+
+    def test_bulk_update_async(self, manager, tmp_path):
+        """Test that targets are updated over one connection per server."""
+        pytest.importorskip("asyncssh")
+        for name in ["customer1", "customer2"]:
+            path = tmp_path / f"{name}.yml"
+            path.write_text("parameters:\n    database_host: localhost\n")
+            manager.config["servers"]["production"]["customers"][name][
+                "parameters_path"
+            ] = str(path)
+        manager.config["ssh_settings"]["backup_dir"] = str(tmp_path / "backups")
+        manager.use_async = True
+        connection = FakeAsyncConnection()
+
+        with patch("asyncssh.connect", return_value=connection) as mock_connect:
+            results = manager.bulk_update_parameter(
+                ["production:customer1", "production:customer2", "invalid"],
+                "database_host",
+                "db.example.com",
+            )
+
+        assert results == {
+            "production:customer1": True,
+            "production:customer2": True,
+            "invalid": False,
+        }
+        mock_connect.assert_called_once()
+        assert mock_connect.call_args.kwargs["known_hosts"] is None
+        content = (tmp_path / "customer2.yml").read_text()
+        assert "database_host: db.example.com" in content
+        assert len(os.listdir(tmp_path / "backups")) >= 1
+        assert len(connection.commands) == 2
+        assert all("sed -i" in command for command in connection.commands)
+
+    def test_bulk_update_async_limits_sessions_per_connection(self, manager):
+        """Test that one server never gets more channels than MaxSessions allows."""
+        pytest.importorskip("asyncssh")
+        customers = manager.config["servers"]["production"]["customers"]
+        targets = []
+        for i in range(12):
+            customers[f"site{i}"] = {"parameters_path": f"/var/www/site{i}.yml"}
+            targets.append(f"production:site{i}")
+        manager.use_async = True
+        active = []
+        peak = []
+
+        async def update_remote(conn, server_name, customer_name, parameters):
+            active.append(customer_name)
+            peak.append(len(active))
+            await asyncio.sleep(0.01)
+            active.remove(customer_name)
+            return True
+
+        with patch("asyncssh.connect", return_value=FakeAsyncConnection()):
+            with patch.object(manager, "_update_remote_async", update_remote):
+                results = manager.bulk_update_parameter(
+                    targets, "database_host", "db.example.com"
+                )
+
+        assert results == {target: True for target in targets}
+        assert max(peak) == 10
+
+
+class TestDownloadBytes:
+    """Test cases for downloading a remote file into memory."""
+
+    def test_download_bytes(self, manager):
+        """Test that the file content is returned without a local file."""
+        client = make_client()
+        sftp = client.open_sftp.return_value
+        sftp.getfo.side_effect = lambda path, fileobj: fileobj.write(
+            b"parameters: {}\n"
+        )
+
+        with patch.object(manager, "_connect", return_value=client):
+            content = manager.download_bytes("production", "/remote/parameters.yml")
+
+        assert content == b"parameters: {}\n"
+        sftp.getfo.assert_called_once()
+        sftp.get.assert_not_called()
+
+    def test_stat_remote(self, manager):
+        """Test that modification time and size are read with one stat call."""
+        client = make_client()
+        attributes = client.open_sftp.return_value.stat.return_value
+        attributes.st_mtime, attributes.st_size = 1700000000, 42
+
+        with patch.object(manager, "_connect", return_value=client):
+            assert manager.stat_remote("production", "/remote/parameters.yml") == (
+                1700000000,
+                42,
+            )
+
+    def test_stat_remote_missing_attributes(self, manager):
+        """Test that a stat without modification time or size yields None."""
+        client = make_client()
+        attributes = client.open_sftp.return_value.stat.return_value
+        attributes.st_mtime, attributes.st_size = None, 42
+
+        with patch.object(manager, "_connect", return_value=client):
+            assert manager.stat_remote("production", "/remote/parameters.yml") is None
+
+    def test_download_bytes_failure(self, manager):
+        """Test that a failed transfer is reported as None."""
+        client = make_client()
+        client.open_sftp.return_value.getfo.side_effect = IOError("No such file")
+
+        with patch.object(manager, "_connect", return_value=client):
+            assert manager.download_bytes("production", "/missing.yml") is None
+
+
+class TestDownloadAllConfigs:
+    """Test cases for downloading all parameter files."""
+
+    def test_download_all_configs(self, manager, tmp_path):
+        """Test that each server uses one SFTP channel for all of its files."""
+        output_dir = tmp_path / "downloads"
+        clients = {}
+
+        def connect(server_name):
+            clients[server_name] = make_client()
+            return clients[server_name]
+
+        with patch.object(manager, "_connect", side_effect=connect):
+            results = manager.download_all_configs(str(output_dir))
+
+        assert results == {
+            "production:customer1": True,
+            "production:customer2": True,
+            "staging:customer3": True,
+        }
+        production = clients["production"]
+        production.open_sftp.assert_called_once()
+        assert production.open_sftp.return_value.get.call_count == 2
+        production.open_sftp.return_value.get.assert_any_call(
+            "/var/www/customer2/app/config/parameters.yml",
+            os.path.join(str(output_dir), "production_customer2_parameters.yml"),
+        )
+
+    def test_download_all_configs_server_failure(self, manager, tmp_path):
+        """Test that a failing server only affects its own customers."""
+
+        def connect(server_name):
+            if server_name == "staging":
+                raise ConnectionError("unreachable")
+            return make_client()
+
+        with patch.object(manager, "_connect", side_effect=connect):
+            results = manager.download_all_configs(str(tmp_path / "downloads"))
+
+        assert results["production:customer1"] is True
+        assert results["staging:customer3"] is False
+
+
+class TestWebConfig:
+    """Test cases for the web interface configuration."""
+
+    def test_generate_web_config(self, manager):
+        """Test that all customers are exported as UTF-8 encoded JSON."""
+        web_config = manager.generate_web_config()
+
+        assert isinstance(web_config, bytes)
+        data = json.loads(web_config)
+        assert list(data) == [
+            "production:customer1",
+            "production:customer2",
+            "staging:customer3",
+        ]
+        assert data["production:customer1"]["file_path"] == (
+            "/var/www/customer1/app/config/parameters.yml"
+        )
+        assert data["staging:customer3"]["parameters"] == {}
+
+    def test_generate_web_config_without_orjson(self, manager):
+        """Test that the stdlib fallback produces the same document."""
+        with patch("ssh_manager.orjson", None):
+            fallback = manager.generate_web_config()
+
+        assert json.loads(fallback) == json.loads(manager.generate_web_config())
+
+
+class TestSecretGeneration:
+    """Test cases for secret generation."""
+
+    def test_generate_secret(self, manager):
+        """Test that secrets have the requested length and alphabet."""
+        secret = manager.generate_secret(48)
+
+        assert len(secret) == 48
+        assert all(c.isalnum() or c in "!@#$%^&*" for c in secret)
+
+    def test_generate_secret_uses_whole_alphabet(self, manager):
+        """Test that long secrets draw from the full alphabet."""
+        secret = manager.generate_secret(5000)
+
+        assert len(secret) == 5000
+        assert set(secret) == set(manager._SECRET_ALPHABET.decode())
+
+    def test_random_secret_other_alphabet(self):
+        """Test that the shared sampler adapts its mask to the alphabet."""
+        alphabet = (string.ascii_letters + string.digits).encode()
+
+        secret = random_secret(alphabet, 5000)
+
+        assert len(secret) == 5000
+        assert set(secret) == set(alphabet.decode())
+        assert random_secret(b"ab", 64).strip("ab") == ""
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
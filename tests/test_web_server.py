@@ -4,7 +4,9 @@ Tests for the web server module.
 """
 
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import patch
+import copy
+import datetime
 import json
 import tempfile
 import os
@@ -14,43 +16,62 @@ import sys
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import web_server
 from web_server import app, init_ssh_manager
 
 
-@pytest.fixture
-def client():
-    """Create a test client for the Flask app."""
-    app.config["TESTING"] = True
-    with app.test_client() as client:
-        yield client
+class _StubSSHManager:
+    """Lightweight stand-in for the SSH manager with canned responses."""
 
+    config = {
+        "servers": {
+            "production": {
+                "host": "test-server.com",
+                "customers": {
+                    "customer1": {
+                        "parameters_path": "/var/www/customer1/app/config/parameters.yml"
+                    }
+                },
+            }
+        }
+    }
 
-@pytest.fixture
-def mock_ssh_manager():
-    """Create a mock SSH manager."""
-    with patch("web_server.ssh_manager") as mock:
-        mock_instance = MagicMock()
-        mock_instance.list_all_customers.return_value = {
+    def list_all_customers(self):
+        return {
             "customer1": {
                 "server": "production",
                 "path": "/var/www/customer1/app/config/parameters.yml",
                 "description": "Test Customer 1",
             }
         }
-        mock_instance.config = {
-            "servers": {
-                "production": {
-                    "host": "test-server.com",
-                    "customers": {
-                        "customer1": {
-                            "parameters_path": "/var/www/customer1/app/config/parameters.yml"
-                        }
-                    },
-                }
-            }
-        }
-        mock.return_value = mock_instance
-        yield mock_instance
+
+    def test_connection(self, server_name):
+        return True
+
+    def stat_remote(self, server_name, remote_path):
+        return None
+
+    def bulk_update_parameter(self, *args, **kwargs):
+        return {"customer1": True}
+
+
+@pytest.fixture(scope="module")
+def ssh_manager_prototype():
+    """Create the stub SSH manager once per module."""
+    return _StubSSHManager()
+
+
+@pytest.fixture
+def mock_ssh_manager(ssh_manager_prototype):
+    """Create a stub SSH manager that tests may adjust freely."""
+    return copy.copy(ssh_manager_prototype)
+
+
+@pytest.fixture(scope="module")
+def generated_secret(client):
+    """Request one secret and share the response with all tests that need it."""
+    response = client.post("/api/generate-secret")
+    return response.status_code, response.get_json()
 
 
 class TestWebServer:
@@ -60,7 +81,7 @@ class TestWebServer:
         """Test the index route serves the HTML file."""
         with patch("web_server.send_from_directory") as mock_send:
             mock_send.return_value = "<html>Test</html>"
-            response = client.get("/")
+            client.get("/")
             mock_send.assert_called_once_with(".", "ssh_web_interface.html")
 
     def test_get_customers_success(self, client, mock_ssh_manager):
@@ -69,7 +90,7 @@ class TestWebServer:
             response = client.get("/api/customers")
 
             assert response.status_code == 200
-            data = json.loads(response.data)
+            data = response.get_json()
             assert data["success"] is True
             assert "customers" in data
             assert data["count"] == 1
@@ -80,31 +101,52 @@ class TestWebServer:
             response = client.get("/api/customers")
 
             assert response.status_code == 500
-            data = json.loads(response.data)
+            data = response.get_json()
             assert "error" in data
 
     def test_get_system_status(self, client, mock_ssh_manager):
         """Test system status endpoint."""
-        mock_ssh_manager.test_connection.return_value = True
-
         with patch("web_server.ssh_manager", mock_ssh_manager):
             response = client.get("/api/status")
 
             assert response.status_code == 200
-            data = json.loads(response.data)
+            data = response.get_json()
             assert data["success"] is True
             assert "servers" in data
             assert "total_customers" in data
 
-    def test_generate_secret(self, client):
+    def test_get_system_status_per_server_errors(self, client, mock_ssh_manager):
+        """Test that a failing server does not affect the other results."""
+
+        def test_connection(server_name):
+            if server_name == "staging":
+                raise Exception("Connection refused")
+            return server_name == "production"
+
+        mock_ssh_manager.config = {
+            "servers": {"production": {}, "staging": {}, "backup": {}}
+        }
+        mock_ssh_manager.test_connection = test_connection
+
+        with patch("web_server.ssh_manager", mock_ssh_manager):
+            response = client.get("/api/status")
+
+            assert response.status_code == 200
+            assert response.get_json()["servers"] == {
+                "production": {"connected": True, "error": None},
+                "staging": {"connected": False, "error": "Connection refused"},
+                "backup": {"connected": False, "error": "Connection failed"},
+            }
+
+    def test_generate_secret(self, generated_secret):
         """Test secret generation endpoint."""
-        response = client.post("/api/generate-secret")
+        status_code, data = generated_secret
 
-        assert response.status_code == 200
-        data = json.loads(response.data)
+        assert status_code == 200
         assert data["success"] is True
         assert "secret" in data
         assert len(data["secret"]) == 64
+        assert data["secret"].isascii() and data["secret"].isalnum()
 
     def test_bulk_update_no_targets(self, client, mock_ssh_manager):
         """Test bulk update with no targets."""
@@ -115,13 +157,11 @@ class TestWebServer:
             )
 
             assert response.status_code == 400
-            data = json.loads(response.data)
+            data = response.get_json()
             assert "error" in data
 
     def test_bulk_update_success(self, client, mock_ssh_manager):
         """Test successful bulk update."""
-        mock_ssh_manager.bulk_update_parameter.return_value = {"customer1": True}
-
         with patch("web_server.ssh_manager", mock_ssh_manager):
             response = client.post(
                 "/api/bulk-update",
@@ -133,17 +173,173 @@ class TestWebServer:
             )
 
             assert response.status_code == 200
-            data = json.loads(response.data)
+            data = response.get_json()
             assert data["success"] is True
             assert "results" in data
 
+    def test_bulk_update_event_stream(self, client, mock_ssh_manager):
+        """Test that a streaming client gets one event per finished server."""
+        mock_ssh_manager.iter_bulk_update_parameter = lambda *args: iter(
+            [{"production:customer1": True}, {"staging:customer3": False}]
+        )
+
+        with patch("web_server.ssh_manager", mock_ssh_manager):
+            response = client.post(
+                "/api/bulk-update",
+                json={
+                    "targets": ["production:customer1", "staging:customer3"],
+                    "parameter_name": "database_host",
+                    "parameter_value": "new-server.com",
+                },
+                headers={"Accept": "text/event-stream"},
+            )
+
+            assert response.status_code == 200
+            assert response.mimetype == "text/event-stream"
+            events = response.get_data(as_text=True).split("\n\n")
+            assert events[0] == 'data: {"results": {"production:customer1": true}}'
+            assert events[1] == 'data: {"results": {"staging:customer3": false}}'
+            assert events[2].startswith("event: done\n")
+            assert "Bulk update completed: 1/2 successful" in events[2]
+
+    def test_download_all_configs(
+        self, client, mock_ssh_manager, tmp_path, monkeypatch
+    ):
+        """Test that the download is delegated to the SSH manager in one call."""
+        monkeypatch.chdir(tmp_path)
+        output_dirs = []
+
+        def download_all_configs(output_dir, separator):
+            output_dirs.append((output_dir, separator))
+            return {"production:customer1": True, "production:customer2": False}
+
+        mock_ssh_manager.download_all_configs = download_all_configs
+
+        with patch("web_server.ssh_manager", mock_ssh_manager):
+            response = client.post("/api/download-all")
+
+            assert response.status_code == 200
+            data = response.get_json()
+            assert data["message"] == "Downloaded 1/2 configurations"
+            assert output_dirs == [("downloaded_configs", ":")]
+
+    def test_get_customer_parameters(self, client, mock_ssh_manager):
+        """Test that the downloaded parameters are parsed from memory."""
+        downloads = []
+
+        def download_bytes(server_name, remote_path):
+            downloads.append((server_name, remote_path))
+            return b"parameters:\n    database_host: localhost\n"
+
+        mock_ssh_manager.download_bytes = download_bytes
+
+        with patch("web_server.ssh_manager", mock_ssh_manager):
+            response = client.get("/api/customer/production:customer1/parameters")
+
+            assert response.status_code == 200
+            data = response.get_json()
+            assert data["parameters"] == {"database_host": "localhost"}
+            assert downloads == [
+                ("production", "/var/www/customer1/app/config/parameters.yml")
+            ]
+
+    def test_get_customer_parameters_etag(self, client, mock_ssh_manager):
+        """Test that an unchanged file is neither downloaded nor parsed again."""
+        web_server._cached_parameters.cache_clear()
+        downloads = []
+
+        def download_bytes(server_name, remote_path):
+            downloads.append(remote_path)
+            return b"parameters:\n    database_host: localhost\n"
+
+        mock_ssh_manager.download_bytes = download_bytes
+        mock_ssh_manager.stat_remote = lambda server_name, remote_path: (1700, 42)
+        url = "/api/customer/production:customer1/parameters"
+
+        with patch("web_server.ssh_manager", mock_ssh_manager):
+            first = client.get(url)
+            second = client.get(url)
+            not_modified = client.get(url, headers={"If-None-Match": '"1700-42"'})
+
+        assert first.status_code == 200
+        assert first.headers["ETag"] == 'W/"1700-42"'
+        assert second.get_json()["parameters"] == {"database_host": "localhost"}
+        assert not_modified.status_code == 304
+        assert not_modified.headers["ETag"] == 'W/"1700-42"'
+        assert len(downloads) == 1
+
+    def test_get_customer_parameters_etag_compressed(self, client, mock_ssh_manager):
+        """Test that a compressed response's ETag still avoids the download."""
+        web_server._cached_parameters.cache_clear()
+        downloads = []
+
+        def download_bytes(server_name, remote_path):
+            downloads.append(remote_path)
+            return b"parameters:\n    database_host: localhost\n"
+
+        mock_ssh_manager.download_bytes = download_bytes
+        mock_ssh_manager.stat_remote = lambda server_name, remote_path: (1700, 42)
+        url = "/api/customer/production:customer1/parameters"
+        headers = {"Accept-Encoding": "gzip"}
+
+        with patch("web_server.ssh_manager", mock_ssh_manager):
+            first = client.get(url, headers=headers)
+            web_server._cached_parameters.cache_clear()
+            not_modified = client.get(
+                url, headers={**headers, "If-None-Match": first.headers["ETag"]}
+            )
+
+        assert first.status_code == 200
+        assert not_modified.status_code == 304
+        assert len(downloads) == 1
+
+    def test_get_customer_parameters_without_stat(self, client, mock_ssh_manager):
+        """Test that parameters are served uncached when the stat fails."""
+        mock_ssh_manager.download_bytes = lambda server_name, remote_path: (
+            b"parameters:\n    database_host: localhost\n"
+        )
+
+        with patch("web_server.ssh_manager", mock_ssh_manager):
+            response = client.get("/api/customer/production:customer1/parameters")
+
+        assert response.status_code == 200
+        assert "ETag" not in response.headers
+        assert response.get_json()["parameters"] == {"database_host": "localhost"}
+
+    def test_get_customer_parameter_keys(self, client, mock_ssh_manager):
+        """Test that fields=keys returns only the parameter names."""
+        mock_ssh_manager.download_bytes = lambda server_name, remote_path: (
+            b"parameters:\n    database_host: localhost\n    mailer: {host: x}\n"
+        )
+
+        with patch("web_server.ssh_manager", mock_ssh_manager):
+            response = client.get(
+                "/api/customer/production:customer1/parameters?fields=keys"
+            )
+
+            assert response.status_code == 200
+            data = response.get_json()
+            assert data["keys"] == ["database_host", "mailer"]
+            assert "parameters" not in data
+
+    def test_get_customer_parameters_not_found(self, client, mock_ssh_manager):
+        """Test that unknown servers and customers are reported separately."""
+        with patch("web_server.ssh_manager", mock_ssh_manager):
+            no_server = client.get("/api/customer/missing:customer1/parameters")
+            no_customer = client.get("/api/customer/production:missing/parameters")
+
+        assert no_server.status_code == 404
+        assert no_server.get_json()["error"] == "Server not found: missing"
+        assert no_customer.status_code == 404
+        assert no_customer.get_json()["error"] == "Customer not found: missing"
+
     def test_invalid_customer_format(self, client, mock_ssh_manager):
         """Test invalid customer ID format."""
         with patch("web_server.ssh_manager", mock_ssh_manager):
             response = client.get("/api/customer/invalid_format/parameters")
 
             assert response.status_code == 400
-            data = json.loads(response.data)
+            data = response.get_json()
             assert "error" in data
 
     def test_404_handler(self, client):
@@ -151,18 +347,32 @@ class TestWebServer:
         response = client.get("/api/nonexistent")
 
         assert response.status_code == 404
-        data = json.loads(response.data)
+        data = response.get_json()
         assert "error" in data
 
 
+class TestJsonProvider:
+    """Test the JSON encoding of responses."""
+
+    def test_orjson_provider_matches_flask_output(self):
+        """Test that orjson encodes values the way Flask's default provider does."""
+        pytest.importorskip("orjson")
+        from flask.json.provider import DefaultJSONProvider
+
+        payload = {"b": 1, "a": [True, None], "date": datetime.date(2024, 1, 2)}
+
+        assert json.loads(app.json.dumps(payload)) == json.loads(
+            DefaultJSONProvider(app).dumps(payload)
+        )
+
+
 class TestInitialization:
     """Test initialization functions."""
 
     @patch("web_server.SSHManager")
     def test_init_ssh_manager_success(self, mock_ssh_class):
         """Test successful SSH manager initialization."""
-        mock_instance = MagicMock()
-        mock_ssh_class.return_value = mock_instance
+        mock_ssh_class.return_value = object()
 
         result = init_ssh_manager()
 
@@ -9,17 +9,18 @@ Author: SSH Parameter Manager Team
 License: MIT
 """
 
-import os
 import sys
 import json
+import functools
 import logging
-import tempfile
+import string
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Callable, Dict, Iterator, List, Any, Optional, Tuple
 from pathlib import Path
 
 try:
-    from flask import Flask, request, jsonify, send_from_directory
+    from flask import Flask, Response, request, jsonify, send_from_directory
     from flask_cors import CORS
     import yaml
 except ImportError as e:
@@ -27,11 +28,51 @@ except ImportError as e:
     print("pip install flask flask-cors pyyaml")
     sys.exit(1)
 
-from ssh_manager import SSHManager
+try:
+    import orjson
+    from flask.json.provider import DefaultJSONProvider
+except ImportError:
+    orjson = None
+
+try:
+    from flask_compress import Compress
+except ImportError:
+    Compress = None
+
+from parameter_updater import YamlLoader, parameter_keys
+from ssh_manager import SSHManager, random_secret
+
+if orjson is not None:
+
+    class _OrjsonProvider(DefaultJSONProvider):
+        """JSON provider that encodes and decodes with orjson."""
+
+        def dumps(self, obj: Any, **kwargs: Any) -> str:
+            # Dates and other extra types still go through Flask's default
+            option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+            if self.sort_keys:
+                option |= orjson.OPT_SORT_KEYS
+            if kwargs.get("indent"):
+                option |= orjson.OPT_INDENT_2
+            return orjson.dumps(obj, default=self.default, option=option).decode()
+
+        def loads(self, s: Any, **kwargs: Any) -> Any:
+            return orjson.loads(s)
+
 
 # Flask application setup
 app = Flask(__name__)
 CORS(app)
+if orjson is not None:
+    app.json = _OrjsonProvider(app)
+if Compress is not None:
+    app.config["COMPRESS_ALGORITHM"] = ["br", "gzip"]
+    # Compressing the bulk update event stream would hold events back
+    app.config["COMPRESS_STREAMS"] = False
+    Compress(app)
+
+# Characters used for generated Symfony secrets
+_SECRET_ALPHABET = (string.ascii_letters + string.digits).encode()
 
 # Global SSH Manager instance
 ssh_manager: Optional[SSHManager] = None
@@ -42,6 +83,12 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+if YamlLoader is yaml.SafeLoader:
+    logger.warning(
+        "libyaml not available, parsing parameters.yml with the pure-Python "
+        "loader; install libyaml and reinstall PyYAML for faster parsing"
+    )
+
 
 def init_ssh_manager() -> bool:
     """
@@ -85,6 +132,26 @@ def serve_assets(filename: str) -> str:
     return send_from_directory("assets", filename)
 
 
+def _server_status(server_name: str) -> Dict[str, Any]:
+    """
+    Test the connection to one server.
+
+    Args:
+        server_name (str): Name of the server in the SSH configuration
+
+    Returns:
+        Dict[str, Any]: Connection flag and error message, if any
+    """
+    try:
+        connection_ok = ssh_manager.test_connection(server_name)
+        return {
+            "connected": connection_ok,
+            "error": None if connection_ok else "Connection failed",
+        }
+    except Exception as e:
+        return {"connected": False, "error": str(e)}
+
+
 @app.route("/api/status", methods=["GET"])
 def get_system_status() -> Tuple[Dict[str, Any], int]:
     """
@@ -97,18 +164,15 @@ def get_system_status() -> Tuple[Dict[str, Any], int]:
         if not ssh_manager:
             return jsonify({"error": "SSH Manager not initialized"}), 500
 
-        # Get server status
+        # Test all server connections concurrently, so the slowest server
+        # rather than the sum of all round trips bounds the response time
+        server_names = list(ssh_manager.config.get("servers", {}))
         servers_status = {}
-        for server_name in ssh_manager.config.get("servers", {}):
-            try:
-                # Test connection
-                connection_ok = ssh_manager.test_connection(server_name)
-                servers_status[server_name] = {
-                    "connected": connection_ok,
-                    "error": None if connection_ok else "Connection failed",
-                }
-            except Exception as e:
-                servers_status[server_name] = {"connected": False, "error": str(e)}
+        if server_names:
+            with ThreadPoolExecutor(max_workers=min(32, len(server_names))) as pool:
+                servers_status = dict(
+                    zip(server_names, pool.map(_server_status, server_names))
+                )
 
         # Count total customers
         total_customers = len(ssh_manager.list_all_customers())
@@ -153,71 +217,134 @@ def get_customers() -> Tuple[Dict[str, Any], int]:
         return jsonify({"error": str(e)}), 500
 
 
-@app.route("/api/customer/<path:customer_id>/parameters", methods=["GET"])
-def get_customer_parameters(customer_id: str) -> Tuple[Dict[str, Any], int]:
+def _download(server_name: str, remote_path: str) -> bytes:
     """
-    Load current parameters for a specific customer.
+    Download a remote file into memory.
+
+    Raises:
+        IOError: If the file could not be downloaded
+    """
+    content = ssh_manager.download_bytes(server_name, remote_path)
+    if content is None:
+        raise IOError("Failed to download parameters file")
+    return content
+
+
+def _parse_parameters(server_name: str, remote_path: str) -> Dict[str, Any]:
+    """
+    Download a parameters file and return its ``parameters`` mapping.
+
+    Raises:
+        IOError: If the file could not be downloaded
+    """
+    data = yaml.load(_download(server_name, remote_path), Loader=YamlLoader)
+    return data.get("parameters", {}) if data else {}
+
+
+@functools.lru_cache(maxsize=128)
+def _cached_parameters(server_name: str, remote_path: str, etag: str) -> Dict[str, Any]:
+    """
+    Like _parse_parameters, cached per file version.
+
+    The ETag (mtime and size) is part of the key, so a changed file is
+    downloaded again. Writes through this server clear the cache, because
+    the SFTP mtime only has a resolution of one second. External edits are
+    not seen that way: two edits of the same size within one second keep
+    the ETag, and the older parameters are served until the next change.
+    """
+    return _parse_parameters(server_name, remote_path)
+
+
+def require_customer_id(view: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Validate the 'server:customer' route argument before calling the view.
 
     Args:
-        customer_id (str): Customer identifier in format 'server:customer'
+        view (Callable[..., Any]): View taking customer_id, server_name and
+            customer_name
 
     Returns:
-        Tuple[Dict[str, Any], int]: JSON response and HTTP status code
+        Callable[..., Any]: View that only takes customer_id
     """
-    try:
-        if not ssh_manager:
-            return jsonify({"error": "SSH Manager not initialized"}), 500
 
-        if ":" not in customer_id:
+    @functools.wraps(view)
+    def wrapper(customer_id: str) -> Tuple[Dict[str, Any], int]:
+        server_name, sep, customer_name = customer_id.partition(":")
+        if not sep:
             return (
                 jsonify(
                     {"error": "Invalid customer format (expected: server:customer)"}
                 ),
                 400,
             )
+        return view(customer_id, server_name, customer_name)
 
-        server_name, customer_name = customer_id.split(":", 1)
+    return wrapper
 
-        # Get customer configuration
-        try:
-            server_config = ssh_manager.config["servers"][server_name]
-            customer_config = server_config["customers"][customer_name]
-            remote_path = customer_config["parameters_path"]
-        except KeyError as e:
-            return jsonify({"error": f"Customer or server not found: {e}"}), 404
-
-        # Download parameters file to temporary location
-        with tempfile.NamedTemporaryFile(
-            mode="w+", suffix=".yml", delete=False
-        ) as temp_file:
-            temp_path = temp_file.name
 
-        try:
-            success = ssh_manager.download_file(server_name, remote_path, temp_path)
-            if not success:
-                return jsonify({"error": "Failed to download parameters file"}), 500
+@app.route("/api/customer/<path:customer_id>/parameters", methods=["GET"])
+@require_customer_id
+def get_customer_parameters(
+    customer_id: str, server_name: str, customer_name: str
+) -> Tuple[Dict[str, Any], int]:
+    """
+    Load current parameters for a specific customer.
 
-            # Parse YAML file
-            with open(temp_path, "r", encoding="utf-8") as f:
-                data = yaml.safe_load(f)
-                parameters = data.get("parameters", {}) if data else {}
+    Args:
+        customer_id (str): Customer identifier in format 'server:customer'
+        server_name (str): Server part of the customer identifier
+        customer_name (str): Customer part of the customer identifier
 
-            return (
-                jsonify(
-                    {
-                        "success": True,
-                        "customer_id": customer_id,
-                        "parameters": parameters,
-                        "file_path": remote_path,
-                    }
-                ),
-                200,
-            )
+    Returns:
+        Tuple[Dict[str, Any], int]: JSON response and HTTP status code
+    """
+    try:
+        if not ssh_manager:
+            return jsonify({"error": "SSH Manager not initialized"}), 500
+
+        # Get customer configuration
+        server_config = ssh_manager.config.get("servers", {}).get(server_name)
+        if server_config is None:
+            return jsonify({"error": f"Server not found: {server_name}"}), 404
+        customer_config = server_config.get("customers", {}).get(customer_name)
+        if customer_config is None:
+            return jsonify({"error": f"Customer not found: {customer_name}"}), 404
+        remote_path = customer_config["parameters_path"]
+
+        # One SFTP stat tells whether the client's copy is still current
+        file_stat = ssh_manager.stat_remote(server_name, remote_path)
+        etag = "%d-%d" % file_stat if file_stat else None
+        # Weak ETag: it names the file version, not the response bytes, and
+        # flask-compress leaves weak ETags alone instead of adding ":gzip"
+        if etag and request.if_none_match.contains_weak(etag):
+            response = app.response_class(status=304)
+            response.set_etag(etag, weak=True)
+            return response
 
-        finally:
-            # Clean up temporary file
-            if os.path.exists(temp_path):
-                os.unlink(temp_path)
+        try:
+            # Only the parameter names were requested; skip building the values
+            if request.args.get("fields") == "keys":
+                body = {"keys": parameter_keys(_download(server_name, remote_path))}
+            elif etag:
+                body = {
+                    "parameters": _cached_parameters(server_name, remote_path, etag)
+                }
+            else:
+                body = {"parameters": _parse_parameters(server_name, remote_path)}
+        except IOError as e:
+            return jsonify({"error": str(e)}), 500
+
+        response = jsonify(
+            {
+                "success": True,
+                "customer_id": customer_id,
+                **body,
+                "file_path": remote_path,
+            }
+        )
+        if etag:
+            response.set_etag(etag, weak=True)
+        return response, 200
 
     except Exception as e:
         logger.error(f"Error getting customer parameters: {e}")
@@ -225,12 +352,17 @@ def get_customer_parameters(customer_id: str) -> Tuple[Dict[str, Any], int]:
 
 
 @app.route("/api/customer/<path:customer_id>/parameters", methods=["POST"])
-def update_customer_parameters(customer_id: str) -> Tuple[Dict[str, Any], int]:
+@require_customer_id
+def update_customer_parameters(
+    customer_id: str, server_name: str, customer_name: str
+) -> Tuple[Dict[str, Any], int]:
     """
     Update parameters for a specific customer.
 
     Args:
         customer_id (str): Customer identifier in format 'server:customer'
+        server_name (str): Server part of the customer identifier
+        customer_name (str): Customer part of the customer identifier
 
     Returns:
         Tuple[Dict[str, Any], int]: JSON response and HTTP status code
@@ -239,25 +371,23 @@ def update_customer_parameters(customer_id: str) -> Tuple[Dict[str, Any], int]:
         if not ssh_manager:
             return jsonify({"error": "SSH Manager not initialized"}), 500
 
-        if ":" not in customer_id:
-            return (
-                jsonify(
-                    {"error": "Invalid customer format (expected: server:customer)"}
-                ),
-                400,
-            )
-
         data = request.get_json()
         if not data or "parameters" not in data:
             return jsonify({"error": "No parameter data received"}), 400
 
-        server_name, customer_name = customer_id.split(":", 1)
         new_parameters = data["parameters"]
 
+        server_config = ssh_manager.config.get("servers", {}).get(server_name)
+        if server_config is None:
+            return jsonify({"error": f"Server not found: {server_name}"}), 404
+        if customer_name not in server_config.get("customers", {}):
+            return jsonify({"error": f"Customer not found: {customer_name}"}), 404
+
         # Update parameters
         success = ssh_manager.update_remote_parameters(
             server_name, customer_name, new_parameters
         )
+        _cached_parameters.cache_clear()
 
         if success:
             logger.info(f"Successfully updated parameters for {customer_id}")
@@ -279,6 +409,42 @@ def update_customer_parameters(customer_id: str) -> Tuple[Dict[str, Any], int]:
         return jsonify({"error": str(e)}), 500
 
 
+def _bulk_update_events(
+    server_results: Iterator[Dict[str, bool]], total: int, parameter_name: str
+) -> Iterator[str]:
+    """
+    Format bulk update results as server-sent events.
+
+    Args:
+        server_results (Iterator[Dict[str, bool]]): Results per finished server
+        total (int): Number of requested targets
+        parameter_name (str): Name of the updated parameter
+
+    Yields:
+        str: One event per finished server, then a final "done" event
+    """
+    success_count = 0
+    try:
+        for results in server_results:
+            success_count += sum(1 for success in results.values() if success)
+            yield f"data: {json.dumps({'results': results})}\n\n"
+    except Exception as e:
+        logger.error(f"Error in bulk update: {e}")
+        yield f"event: error\ndata: {json.dumps({'error': str(e)})}\n\n"
+        return
+    finally:
+        _cached_parameters.cache_clear()
+
+    logger.info(f"Bulk update completed: {success_count}/{total} successful")
+    summary = {
+        "success": True,
+        "message": f"Bulk update completed: {success_count}/{total} successful",
+        "parameter_name": parameter_name,
+        "timestamp": datetime.now().isoformat(),
+    }
+    yield f"event: done\ndata: {json.dumps(summary)}\n\n"
+
+
 @app.route("/api/bulk-update", methods=["POST"])
 def bulk_update_parameters() -> Tuple[Dict[str, Any], int]:
     """
@@ -306,10 +472,25 @@ def bulk_update_parameters() -> Tuple[Dict[str, Any], int]:
         if parameter_value is None:
             return jsonify({"error": "No parameter value specified"}), 400
 
+        # Clients accepting an event stream get each server's results as soon
+        # as that server is done instead of waiting for the slowest one
+        if request.accept_mimetypes.best == "text/event-stream":
+            return Response(
+                _bulk_update_events(
+                    ssh_manager.iter_bulk_update_parameter(
+                        targets, parameter_name, parameter_value
+                    ),
+                    len(targets),
+                    parameter_name,
+                ),
+                mimetype="text/event-stream",
+            )
+
         # Perform bulk update
         results = ssh_manager.bulk_update_parameter(
             targets, parameter_name, parameter_value
         )
+        _cached_parameters.cache_clear()
 
         success_count = sum(1 for success in results.values() if success)
 
@@ -335,12 +516,17 @@ def bulk_update_parameters() -> Tuple[Dict[str, Any], int]:
 
 
 @app.route("/api/backup/<path:customer_id>", methods=["POST"])
-def create_backup(customer_id: str) -> Tuple[Dict[str, Any], int]:
+@require_customer_id
+def create_backup(
+    customer_id: str, server_name: str, customer_name: str
+) -> Tuple[Dict[str, Any], int]:
     """
     Create a backup for a specific customer.
 
     Args:
         customer_id (str): Customer identifier in format 'server:customer'
+        server_name (str): Server part of the customer identifier
+        customer_name (str): Customer part of the customer identifier
 
     Returns:
         Tuple[Dict[str, Any], int]: JSON response and HTTP status code
@@ -349,16 +535,6 @@ def create_backup(customer_id: str) -> Tuple[Dict[str, Any], int]:
         if not ssh_manager:
             return jsonify({"error": "SSH Manager not initialized"}), 500
 
-        if ":" not in customer_id:
-            return (
-                jsonify(
-                    {"error": "Invalid customer format (expected: server:customer)"}
-                ),
-                400,
-            )
-
-        server_name, customer_name = customer_id.split(":", 1)
-
         # Create backup
         backup_path = ssh_manager.create_backup(server_name, customer_name)
 
@@ -392,12 +568,8 @@ def generate_secret() -> Tuple[Dict[str, Any], int]:
         Tuple[Dict[str, Any], int]: JSON response and HTTP status code
     """
     try:
-        import secrets
-        import string
-
-        # Generate a secure random string
-        alphabet = string.ascii_letters + string.digits
-        secret = "".join(secrets.choice(alphabet) for _ in range(64))
+        # Same rejection sampler as the CLI, with a letters and digits alphabet
+        secret = random_secret(_SECRET_ALPHABET, 64)
 
         return (
             jsonify(
@@ -432,32 +604,22 @@ def download_all_configs() -> Tuple[Dict[str, Any], int]:
         download_dir = Path("downloaded_configs")
         download_dir.mkdir(exist_ok=True)
 
-        customers = ssh_manager.list_all_customers()
-        downloaded_count = 0
-
-        for customer_id, customer_info in customers.items():
-            try:
-                server_name = customer_info["server"]
-                remote_path = customer_info["path"]
-                local_path = download_dir / f"{customer_id}_parameters.yml"
-
-                success = ssh_manager.download_file(
-                    server_name, remote_path, str(local_path)
-                )
-
-                if success:
-                    downloaded_count += 1
+        # Servers are downloaded in parallel, one connection per server; files
+        # keep the <server>:<customer>_parameters.yml names of this endpoint
+        results = ssh_manager.download_all_configs(str(download_dir), separator=":")
+        downloaded_count = sum(results.values())
 
-            except Exception as e:
-                logger.warning(f"Failed to download config for {customer_id}: {e}")
+        for customer_id, success in results.items():
+            if not success:
+                logger.warning(f"Failed to download config for {customer_id}")
 
-        logger.info(f"Downloaded {downloaded_count}/{len(customers)} configurations")
+        logger.info(f"Downloaded {downloaded_count}/{len(results)} configurations")
 
         return (
             jsonify(
                 {
                     "success": True,
-                    "message": f"Downloaded {downloaded_count}/{len(customers)} configurations",
+                    "message": f"Downloaded {downloaded_count}/{len(results)} configurations",
                     "download_directory": str(download_dir.absolute()),
                     "timestamp": datetime.now().isoformat(),
                 }
@@ -491,12 +653,19 @@ def main() -> None:
         logger.error("Failed to initialize SSH Manager. Exiting.")
         sys.exit(1)
 
-    # Start Flask development server
     logger.info("Starting SSH Parameter Manager Web Server...")
     logger.info("Access the web interface at: http://localhost:5000")
 
     try:
-        app.run(host="127.0.0.1", port=5000, debug=False, threaded=True)
+        # Serve with waitress when installed; it handles concurrent SSH-bound
+        # requests with a thread pool. One process keeps one connection pool.
+        try:
+            from waitress import serve
+        except ImportError:
+            logger.info("waitress not installed, using the Flask development server")
+            app.run(host="127.0.0.1", port=5000, debug=False, threaded=True)
+        else:
+            serve(app, host="127.0.0.1", port=5000, threads=16)
     except KeyboardInterrupt:
         logger.info("Server stopped by user")
     except Exception as e: